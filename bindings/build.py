@@ -17,7 +17,8 @@ import os
 
 from cffi import FFI
 
-HEADERS = glob.glob(os.path.join(os.path.abspath(os.path.dirname(__file__)), "*.h"))
+BINDINGS_DIR = os.path.abspath(os.path.dirname(__file__))
+HEADERS = glob.glob(os.path.join(BINDINGS_DIR, "*.h"))
 
 
 ffi = FFI()
@@ -27,4 +28,6 @@ for header in HEADERS:
 source = """
 #include <sodium.h>
 """
+with open(os.path.join(BINDINGS_DIR, "pyring.c"), "r") as cfile:
+    source += cfile.read()
 ffi.set_source("_sodium", source, libraries=["sodium"])
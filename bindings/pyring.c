@@ -0,0 +1,409 @@
+/*
+ * Copyright 2019 Google LLC
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *      http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Helpers built on top of the group arithmetic of the bundled (statically linked)
+ * libsodium. These functions are not part of libsodium's public API, so the types
+ * are declared here. Field elements are 40 bytes wide for both the 51-bit and the
+ * 25.5-bit limb representations, so they can be treated as opaque.
+ */
+
+#include <stdint.h>
+#include <string.h>
+
+/*
+ The layouts below and the internal functions used must match the bundled libsodium
+ (1.0.20), so check the version before anything is built against them.
+ */
+#if SODIUM_LIBRARY_VERSION_MAJOR != 26 || SODIUM_LIBRARY_VERSION_MINOR != 2
+#error "pyring.c relies on the internals of libsodium 1.0.20"
+#endif
+
+typedef struct {
+    uint64_t limbs[5];
+} pyring_fe25519;
+
+typedef struct {
+    pyring_fe25519 X;
+    pyring_fe25519 Y;
+    pyring_fe25519 Z;
+} ge25519_p2;
+
+typedef struct {
+    pyring_fe25519 X;
+    pyring_fe25519 Y;
+    pyring_fe25519 Z;
+    pyring_fe25519 T;
+} ge25519_p3;
+
+typedef struct {
+    pyring_fe25519 X;
+    pyring_fe25519 Y;
+    pyring_fe25519 Z;
+    pyring_fe25519 T;
+} ge25519_p1p1;
+
+typedef struct {
+    pyring_fe25519 YplusX;
+    pyring_fe25519 YminusX;
+    pyring_fe25519 Z;
+    pyring_fe25519 T2d;
+} ge25519_cached;
+
+/* The odd multiples P, 3P, 5P, ..., 15P of a point */
+typedef struct {
+    ge25519_cached multiples[8];
+} pyring_table;
+
+#define PYRING_TABLEBYTES sizeof(pyring_table)
+#define PYRING_P3BYTES sizeof(ge25519_p3)
+
+void ge25519_tobytes(unsigned char *s, const ge25519_p2 *h);
+void ge25519_p3_tobytes(unsigned char *s, const ge25519_p3 *h);
+int ge25519_frombytes(ge25519_p3 *h, const unsigned char *s);
+void ge25519_p3_to_cached(ge25519_cached *r, const ge25519_p3 *p);
+void ge25519_p1p1_to_p3(ge25519_p3 *r, const ge25519_p1p1 *p);
+void ge25519_add(ge25519_p1p1 *r, const ge25519_p3 *p, const ge25519_cached *q);
+void ge25519_sub(ge25519_p1p1 *r, const ge25519_p3 *p, const ge25519_cached *q);
+void ge25519_double_scalarmult_vartime(ge25519_p2 *r, const unsigned char *a,
+                                       const ge25519_p3 *A, const unsigned char *b);
+int ge25519_is_canonical(const unsigned char *s);
+int ge25519_is_on_curve(const ge25519_p3 *p);
+int ge25519_is_on_main_subgroup(const ge25519_p3 *p);
+int ge25519_has_small_order(const unsigned char s[32]);
+void sc25519_muladd(unsigned char s[32], const unsigned char a[32],
+                    const unsigned char b[32], const unsigned char c[32]);
+
+/* Decode a point, applying the same checks as crypto_scalarmult_ed25519 */
+static int
+pyring_frombytes(ge25519_p3 *h, const unsigned char *s)
+{
+    if (ge25519_is_canonical(s) == 0 || ge25519_has_small_order(s) != 0 ||
+        ge25519_frombytes(h, s) != 0 || ge25519_is_on_main_subgroup(h) == 0) {
+        return -1;
+    }
+    return 0;
+}
+
+/*
+ q = a * p + b * B where B is the base point
+
+ Scalars are not clamped, but their most significant bit is ignored, the same as
+ for crypto_scalarmult_ed25519_noclamp. This function is not constant time and
+ should only be used with public scalars.
+ */
+int
+pyring_double_scalarmult_base_vartime(unsigned char *q, const unsigned char *a,
+                                      const unsigned char *p, const unsigned char *b)
+{
+    unsigned char a_[32];
+    unsigned char b_[32];
+    ge25519_p3    P;
+    ge25519_p2    Q;
+
+    if (pyring_frombytes(&P, p) != 0) {
+        return -1;
+    }
+    memcpy(a_, a, 32);
+    memcpy(b_, b, 32);
+    a_[31] &= 127;
+    b_[31] &= 127;
+
+    ge25519_double_scalarmult_vartime(&Q, a_, &P, b_);
+    ge25519_tobytes(q, &Q);
+    return 0;
+}
+
+/*
+ Decompress a point to extended coordinates, applying the same checks as
+ crypto_core_ed25519_add
+ */
+int
+pyring_p3_frombytes(unsigned char *h, const unsigned char *s)
+{
+    ge25519_p3 *h_ = (ge25519_p3 *) h;
+
+    if (ge25519_frombytes(h_, s) != 0 || ge25519_is_on_curve(h_) == 0) {
+        return -1;
+    }
+    return 0;
+}
+
+/*
+ r = p + q for points in extended coordinates
+
+ The sum is written both compressed (to r) and in extended coordinates (to r_p3),
+ so that it can be used in further arithmetic without being decompressed.
+ */
+void
+pyring_p3_add(unsigned char *r, unsigned char *r_p3, const unsigned char *p,
+              const unsigned char *q)
+{
+    ge25519_p1p1   t;
+    ge25519_cached q_cached;
+
+    ge25519_p3_to_cached(&q_cached, (const ge25519_p3 *) q);
+    ge25519_add(&t, (const ge25519_p3 *) p, &q_cached);
+    ge25519_p1p1_to_p3((ge25519_p3 *) r_p3, &t);
+    ge25519_p3_tobytes(r, (const ge25519_p3 *) r_p3);
+}
+
+/* r = p - q for points in extended coordinates, see pyring_p3_add */
+void
+pyring_p3_sub(unsigned char *r, unsigned char *r_p3, const unsigned char *p,
+              const unsigned char *q)
+{
+    ge25519_p1p1   t;
+    ge25519_cached q_cached;
+
+    ge25519_p3_to_cached(&q_cached, (const ge25519_p3 *) q);
+    ge25519_sub(&t, (const ge25519_p3 *) p, &q_cached);
+    ge25519_p1p1_to_p3((ge25519_p3 *) r_p3, &t);
+    ge25519_p3_tobytes(r, (const ge25519_p3 *) r_p3);
+}
+
+/*
+ r = 2 * p
+
+ libsodium's doubling formulas are internal, but the addition formulas are complete
+ so they can be used instead.
+ */
+static void
+pyring_p3_dbl(ge25519_p3 *r, const ge25519_p3 *p)
+{
+    ge25519_cached c;
+    ge25519_p1p1   t;
+
+    ge25519_p3_to_cached(&c, p);
+    ge25519_add(&t, p, &c);
+    ge25519_p1p1_to_p3(r, &t);
+}
+
+/*
+ Recode a scalar into signed odd digits in [-15, 15] with at least 4 zeros between
+ non-zero digits (the same recoding as libsodium's slide_vartime)
+ */
+static void
+pyring_slide_vartime(signed char *r, const unsigned char *a)
+{
+    int i;
+    int b;
+    int k;
+    int ribs;
+    int cmp;
+
+    for (i = 0; i < 256; ++i) {
+        r[i] = 1 & (a[i >> 3] >> (i & 7));
+    }
+    for (i = 0; i < 256; ++i) {
+        if (! r[i]) {
+            continue;
+        }
+        for (b = 1; b <= 6 && i + b < 256; ++b) {
+            if (! r[i + b]) {
+                continue;
+            }
+            ribs = r[i + b] << b;
+            cmp = r[i] + ribs;
+            if (cmp <= 15) {
+                r[i] = cmp;
+                r[i + b] = 0;
+            } else {
+                cmp = r[i] - ribs;
+                if (cmp < -15) {
+                    break;
+                }
+                r[i] = cmp;
+                for (k = i + b; k < 256; ++k) {
+                    if (! r[k]) {
+                        r[k] = 1;
+                        break;
+                    }
+                    r[k] = 0;
+                }
+            }
+        }
+    }
+}
+
+/* Add the (signed, odd) multiple of a point given by a digit of the recoding */
+static void
+pyring_add_digit(ge25519_p3 *r, const pyring_table *table, signed char digit)
+{
+    ge25519_p1p1 t;
+
+    if (digit > 0) {
+        ge25519_add(&t, r, &table->multiples[digit / 2]);
+    } else if (digit < 0) {
+        ge25519_sub(&t, r, &table->multiples[(-digit) / 2]);
+    } else {
+        return;
+    }
+    ge25519_p1p1_to_p3(r, &t);
+}
+
+/*
+ Fill a table with the odd multiples of p so that it can be reused across scalar
+ multiplications
+ */
+int
+pyring_precompute(unsigned char *table, const unsigned char *p)
+{
+    pyring_table *t = (pyring_table *) table;
+    ge25519_p1p1  s;
+    ge25519_p3    P;
+    ge25519_p3    P2;
+    ge25519_p3    u;
+    int           i;
+
+    if (pyring_frombytes(&P, p) != 0) {
+        return -1;
+    }
+    ge25519_p3_to_cached(&t->multiples[0], &P);
+    pyring_p3_dbl(&P2, &P);
+    for (i = 1; i < 8; ++i) {
+        ge25519_add(&s, &P2, &t->multiples[i - 1]);
+        ge25519_p1p1_to_p3(&u, &s);
+        ge25519_p3_to_cached(&t->multiples[i], &u);
+    }
+    return 0;
+}
+
+/*
+ q = a * A + b * B where A and B are given by their precomputed tables
+
+ Scalars are handled as in pyring_double_scalarmult_base_vartime. This function is
+ not constant time and should only be used with public scalars.
+ */
+void
+pyring_double_scalarmult_vartime(unsigned char *q, const unsigned char *a,
+                                 const unsigned char *A, const unsigned char *b,
+                                 const unsigned char *B)
+{
+    static const unsigned char identity[32] = { 1 };
+    unsigned char a_[32];
+    unsigned char b_[32];
+    signed char   aslide[256];
+    signed char   bslide[256];
+    ge25519_p3    r;
+    int           i;
+
+    memcpy(a_, a, 32);
+    memcpy(b_, b, 32);
+    a_[31] &= 127;
+    b_[31] &= 127;
+    pyring_slide_vartime(aslide, a_);
+    pyring_slide_vartime(bslide, b_);
+
+    ge25519_frombytes(&r, identity);
+
+    for (i = 255; i >= 0; --i) {
+        if (aslide[i] || bslide[i]) {
+            break;
+        }
+    }
+    for (; i >= 0; --i) {
+        pyring_p3_dbl(&r, &r);
+        pyring_add_digit(&r, (const pyring_table *) A, aslide[i]);
+        pyring_add_digit(&r, (const pyring_table *) B, bslide[i]);
+    }
+    ge25519_p3_tobytes(q, &r);
+}
+
+/*
+ Compute the points that are hashed for the members of a ring signature
+
+ For each member i, this writes c_i * P_i + r_i * B followed by
+ r_i * H_p(P_i) + c_i * I to out, where B is the base point, P_i the public key,
+ and I the key image. The hashed public keys and the key image are given by their
+ precomputed tables. Returns -1 if one of the public keys is not a valid point.
+ */
+int
+pyring_ring_points(unsigned char *out, const unsigned char *r,
+                   const unsigned char *c, const unsigned char *keys,
+                   const unsigned char *const *hashed_tables,
+                   const unsigned char *key_image_table, size_t n)
+{
+    size_t i;
+
+    for (i = 0; i < n; ++i) {
+        if (pyring_double_scalarmult_base_vartime(out, &c[32 * i], &keys[32 * i],
+                                                  &r[32 * i]) != 0) {
+            return -1;
+        }
+        pyring_double_scalarmult_vartime(&out[32], &r[32 * i], hashed_tables[i],
+                                         &c[32 * i], key_image_table);
+        out += 64;
+    }
+    return 0;
+}
+
+/*
+ s = (scalars[0] + ... + scalars[n - 1]) mod L
+
+ The scalars are accumulated into a 64-byte integer, so that only a single
+ reduction is needed.
+ */
+void
+pyring_scalar_sum(unsigned char *s, const unsigned char *scalars, size_t n)
+{
+    unsigned char t[64];
+    unsigned char u[64];
+    size_t        i;
+
+    memset(t, 0, sizeof t);
+    memset(u, 0, sizeof u);
+    for (i = 0; i < n; ++i) {
+        memcpy(u, &scalars[32 * i], 32);
+        sodium_add(t, u, sizeof t);
+    }
+    crypto_core_ed25519_scalar_reduce(s, t);
+}
+
+/*
+ s = (a * b + c) mod L
+
+ Like the scalar arithmetic in libsodium, this is constant time.
+ */
+void
+pyring_scalar_muladd(unsigned char *s, const unsigned char *a,
+                     const unsigned char *b, const unsigned char *c)
+{
+    sc25519_muladd(s, a, b, c);
+}
+
+/* s = (c - a * b) mod L, see pyring_scalar_muladd */
+void
+pyring_scalar_mulsub(unsigned char *s, const unsigned char *a,
+                     const unsigned char *b, const unsigned char *c)
+{
+    unsigned char neg_a[32];
+
+    crypto_core_ed25519_scalar_negate(neg_a, a);
+    sc25519_muladd(s, neg_a, b, c);
+}
+
+/* out[i] = (a[i] + b[i]) mod L for i = 0, ..., n - 1 */
+void
+pyring_scalar_batch_add(unsigned char *const *out, const unsigned char *const *a,
+                        const unsigned char *const *b, size_t n)
+{
+    size_t i;
+
+    for (i = 0; i < n; ++i) {
+        crypto_core_ed25519_scalar_add(out[i], a[i], b[i]);
+    }
+}
@@ -0,0 +1,43 @@
+/*
+ * Copyright 2019 Google LLC
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *      http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#define PYRING_TABLEBYTES ...
+#define PYRING_P3BYTES ...
+
+int pyring_double_scalarmult_base_vartime(unsigned char *q, const unsigned char *a,
+                                          const unsigned char *p,
+                                          const unsigned char *b);
+int pyring_p3_frombytes(unsigned char *h, const unsigned char *s);
+void pyring_p3_add(unsigned char *r, unsigned char *r_p3, const unsigned char *p,
+                   const unsigned char *q);
+void pyring_p3_sub(unsigned char *r, unsigned char *r_p3, const unsigned char *p,
+                   const unsigned char *q);
+int pyring_precompute(unsigned char *table, const unsigned char *p);
+void pyring_double_scalarmult_vartime(unsigned char *q, const unsigned char *a,
+                                      const unsigned char *A, const unsigned char *b,
+                                      const unsigned char *B);
+int pyring_ring_points(unsigned char *out, const unsigned char *r,
+                       const unsigned char *c, const unsigned char *keys,
+                       const unsigned char *const *hashed_tables,
+                       const unsigned char *key_image_table, size_t n);
+void pyring_scalar_muladd(unsigned char *s, const unsigned char *a,
+                          const unsigned char *b, const unsigned char *c);
+void pyring_scalar_mulsub(unsigned char *s, const unsigned char *a,
+                          const unsigned char *b, const unsigned char *c);
+void pyring_scalar_batch_add(unsigned char *const *out,
+                             const unsigned char *const *a,
+                             const unsigned char *const *b, size_t n);
+void pyring_scalar_sum(unsigned char *s, const unsigned char *scalars, size_t n);
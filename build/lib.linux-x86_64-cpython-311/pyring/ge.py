@@ -0,0 +1,322 @@
+# Copyright 2019 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Elliptic curve arithmetic.
+
+This module contains utitilities to perform elliptic curve arithmetic (adding and
+multiplying points on the Ed25519 curve).
+
+Attributes:
+    Q: Prime order of the field that the Ed25519 curve is defined over.
+    O: The identity element of the Ed25519 curve.
+    G: The generator (base point) of the Ed25519 curve.
+
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Iterable, Optional, Tuple, cast
+
+from .utils import as_array, as_array_readonly, ByteLike, UCHAR_ARRAY
+from .sc25519 import ScalarLike, Scalar
+from ._sodium import ffi, lib
+
+# Calculate the base point (generator) so that it can be used in additions/subtractions
+# We need to find 4 / 5 on the prime field defined by prime q = 2^255 - 19
+Q = 2 ** 255 - 19
+# NB: Fermat's little theorem
+_GENERATOR_DATA = (4 * pow(5, Q - 2, Q)).to_bytes(
+    lib.crypto_core_ed25519_BYTES, "little"
+)
+_IDENTITY_DATA = (1).to_bytes(lib.crypto_core_ed25519_BYTES, "little")
+
+
+def _digest(data: ByteLike, hash_name: str) -> ByteLike:
+    """Hash data, using libsodium for BLAKE2b and hashlib for other algorithms.
+
+    Neither path copies the data: FFI arrays are passed to hashlib through the buffer
+    protocol and other buffers are passed to libsodium as pointers.
+    """
+    if hash_name != "blake2b":
+        if isinstance(data, ffi.CData):
+            data = ffi.buffer(data)
+        return hashlib.new(hash_name, data).digest()
+    if not isinstance(data, ffi.CData):
+        data = ffi.from_buffer(UCHAR_ARRAY, data)
+    digest = ffi.new(UCHAR_ARRAY, lib.crypto_generichash_blake2b_BYTES_MAX)
+    lib.crypto_generichash_blake2b(digest, len(digest), data, len(data), ffi.NULL, 0)
+    return digest
+
+
+class Point:
+    """A point on the Ed25519 curve.
+
+    A point on a twisted Edwards curve over the prime field with order 2^255 - 19. The
+    base point of the curve is (x, 4/5) with x "positive" (meaning its first bit is not
+    set). The order of this curve is L = 2^252 + 2774...
+
+    Attributes:
+        data: The point stored as its y coordinate using a 32-byte integer in little-
+            endian format. The last bit is used to store the parity of x.
+    """
+
+    __slots__ = ["data", "_p3", "_table", "_hashed"]
+
+    def __init__(self, data: ByteLike = _IDENTITY_DATA) -> None:
+        if len(data) != lib.crypto_core_ed25519_BYTES:
+            raise ValueError(f"data must be {lib.crypto_core_ed25519_BYTES} bytes")
+        self.data = as_array(data)
+        self._p3: Optional[ffi.CData] = None
+        self._table: Optional[ffi.CData] = None
+        self._hashed: Optional[Tuple[str, Point]] = None
+
+    def __repr__(self) -> str:
+        return f"Point({self.as_bytes()})"
+
+    @classmethod
+    def _new(cls) -> Point:
+        """Allocate an identity point to write the result of an operation into.
+
+        This avoids the conversion done by the constructor, which dominates the cost
+        of small operations.
+        """
+        out = cls.__new__(cls)
+        out.data = ffi.new(UCHAR_ARRAY, lib.crypto_core_ed25519_BYTES)
+        out.data[0] = 1
+        out._p3 = None
+        out._table = None
+        out._hashed = None
+        return out
+
+    def __hash__(self) -> int:
+        return hash(ffi.buffer(self.data)[:])
+
+    def as_bytes(self) -> bytes:
+        return bytes(self.data)
+
+    def write_into(self, buffer: bytearray, offset: int) -> None:
+        """Write the point into a buffer without creating an intermediate copy."""
+        end = offset + lib.crypto_core_ed25519_BYTES
+        buffer[offset:end] = ffi.buffer(self.data)
+
+    @classmethod
+    def from_uniform(cls, n: ByteLike) -> Point:
+        """Map a set of 32-bytes to a point on the curve."""
+        out = cls._new()
+        if len(n) != lib.crypto_core_ed25519_UNIFORMBYTES:
+            raise ValueError(
+                f"uniform data must be {lib.crypto_core_ed25519_UNIFORMBYTES} bytes"
+            )
+        lib.crypto_core_ed25519_from_uniform(out.data, as_array_readonly(n))
+        return out
+
+    @classmethod
+    def from_hash(cls, n: ByteLike) -> Point:
+        out = cls._new()
+        if len(n) != lib.crypto_core_ed25519_HASHBYTES:
+            raise ValueError(f"hash must be {lib.crypto_core_ed25519_HASHBYTES} bytes")
+        lib.crypto_core_ed25519_from_hash(out.data, as_array_readonly(n))
+        return out
+
+    def _as_p3(self) -> Optional[ffi.CData]:
+        """The point in extended coordinates, or None if it is not on the curve.
+
+        Decompressing a point requires a square root in the field, so the result is
+        cached on the point and results of arithmetic are stored in this form too.
+        """
+        if self._p3 is None:
+            p3 = ffi.new(UCHAR_ARRAY, lib.PYRING_P3BYTES)
+            if lib.pyring_p3_frombytes(p3, self.data):
+                return None
+            self._p3 = p3
+        return self._p3
+
+    def precompute(self) -> Point:
+        """Precompute the multiples of this point used by `double_scalar_mult`.
+
+        The table is stored on the point, so that the cost of computing it is shared
+        by all the multiplications the point is used in.
+
+        Raises:
+            ValueError: If the point is not valid.
+
+        """
+        if self._table is None:
+            table = ffi.new(UCHAR_ARRAY, lib.PYRING_TABLEBYTES)
+            if lib.pyring_precompute(table, self.data):
+                raise ValueError("invalid point")
+            self._table = table
+        return self
+
+    def is_valid(self) -> bool:
+        return cast(bool, lib.crypto_core_ed25519_is_valid_point(self.data) == 1)
+
+    def __add__(self, other: Point) -> Point:
+        """Add two points."""
+        if not isinstance(other, Point):
+            return NotImplemented
+        p, q = self._as_p3(), other._as_p3()
+        out = Point._new()
+        if p is not None and q is not None:
+            out._p3 = ffi.new(UCHAR_ARRAY, lib.PYRING_P3BYTES)
+            lib.pyring_p3_add(out.data, out._p3, p, q)
+        return out
+
+    def __sub__(self, other: Point) -> Point:
+        """Subtract two points."""
+        if not isinstance(other, Point):
+            return NotImplemented
+        p, q = self._as_p3(), other._as_p3()
+        out = Point._new()
+        if p is not None and q is not None:
+            out._p3 = ffi.new(UCHAR_ARRAY, lib.PYRING_P3BYTES)
+            lib.pyring_p3_sub(out.data, out._p3, p, q)
+        return out
+
+    def __rmul__(self, other: ScalarLike) -> Point:
+        """Left-multiply the point by a scalar."""
+        if isinstance(other, int):
+            other = Scalar(other)
+        elif not isinstance(other, Scalar):
+            return NotImplemented
+        out = Point._new()
+        lib.crypto_scalarmult_ed25519_noclamp(out.data, other.data, self.data)
+        return out
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Point):
+            result = lib.sodium_memcmp(
+                self.data, other.data, lib.crypto_core_ed25519_BYTES
+            )
+            return cast(bool, result == 0)
+        else:
+            return False
+
+    def hash_to_point(self, hash_name: str = "blake2b") -> Point:
+        """Hash this point to a point on the curve.
+
+        The result is cached on the point, since it is needed repeatedly when the
+        point is used as a public key.
+        """
+        if self._hashed is not None and self._hashed[0] == hash_name:
+            return self._hashed[1]
+        digest = _digest(self.data, hash_name)
+        if len(digest) == lib.crypto_core_ed25519_HASHBYTES:
+            point = Point.from_hash(digest)
+        elif len(digest) == lib.crypto_core_ed25519_UNIFORMBYTES:
+            point = Point.from_uniform(digest)
+        else:
+            raise ValueError(f"hash function returned {len(digest)} bytes")
+        self._hashed = (hash_name, point)
+        return point
+
+
+class Generator(Point):
+    """The generator (base point) of the Ed25519 curve.
+
+    Multiplication with the base point is special cased.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(_GENERATOR_DATA)
+
+    def __rmul__(self, other: ScalarLike) -> Point:
+        if isinstance(other, int):
+            other = Scalar(other)
+        elif not isinstance(other, Scalar):
+            return NotImplemented
+        out = Point._new()
+        lib.crypto_scalarmult_ed25519_base_noclamp(out.data, other.data)
+        return out
+
+
+O = Point()  # noqa: 741
+G = Generator()
+
+
+def double_scalar_mult(a: ScalarLike, A: Point, b: ScalarLike, B: Point = G) -> Point:
+    """Compute aA + bB.
+
+    The two multiplications share their doublings. This is not constant time, so it
+    should only be used with public scalars (e.g. during verification).
+
+    Points that are used repeatedly should be precomputed (see `Point.precompute`),
+    except for the base point, which has a precomputed table in libsodium.
+
+    Raises:
+        ValueError: If A or B is not a valid point.
+
+    """
+    if isinstance(a, int):
+        a = Scalar(a)
+    if isinstance(b, int):
+        b = Scalar(b)
+    out = Point._new()
+    if isinstance(B, Generator):
+        if lib.pyring_double_scalarmult_base_vartime(
+            out.data, a.data, A.data, b.data
+        ):
+            raise ValueError("invalid point")
+    else:
+        A.precompute()
+        B.precompute()
+        lib.pyring_double_scalarmult_vartime(
+            out.data, a.data, A._table, b.data, B._table
+        )
+    return out
+
+
+def hash_to_scalar(data: ByteLike, hash_name: str = "blake2b") -> Scalar:
+    """Hash data to a scalar.
+
+    The challenges of a ring signature are scalars, so the digest is reduced modulo
+    the order of the curve, L (and not modulo Q).
+
+    Args:
+        data: An object convertible to bytes that will be hashed.
+        hash: The hashing algorithm to use. Its digest can be at most 64 bytes.
+
+    Returns:
+        A scalar in the range [0, ..., L - 1] where L = 2^252 + 2774...
+
+    """
+    return _reduce_digest(_digest(data, hash_name))
+
+
+def hash_chunks_to_scalar(
+    chunks: Iterable[ByteLike], hash_name: str = "blake2b"
+) -> Scalar:
+    """Hash the concatenation of chunks of data to a scalar.
+
+    The chunks are fed to the hash function one by one, so they never need to be
+    concatenated into a single buffer. The result is the same as calling
+    `hash_to_scalar` on the concatenated data.
+    """
+    hash_ = hashlib.new(hash_name)
+    for chunk in chunks:
+        if isinstance(chunk, ffi.CData):
+            chunk = ffi.buffer(chunk)
+        hash_.update(chunk)
+    return _reduce_digest(hash_.digest())
+
+
+def _reduce_digest(digest: ByteLike) -> Scalar:
+    if len(digest) == lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES:
+        return Scalar.from_unreduced(digest)
+    elif len(digest) < lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES:
+        return Scalar.from_unreduced(
+            bytes(digest).ljust(lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES, b"\0")
+        )
+    else:
+        raise ValueError(f"hash function returned {len(digest)} bytes")
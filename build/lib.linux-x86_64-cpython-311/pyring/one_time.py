@@ -0,0 +1,294 @@
+# Copyright 2019 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import os
+from typing import ByteString, Dict, List, Optional, Tuple, cast
+
+from .ge import Point, G, hash_chunks_to_scalar
+from .sc25519 import Scalar
+from .utils import ByteLike
+from ._sodium import ffi, lib
+
+
+class PrivateKey:
+    __slots__ = ["scalar", "_public_key", "_key_image"]
+
+    def __init__(self, scalar: Scalar) -> None:
+        self.scalar = scalar
+        self._public_key: Optional[PublicKey] = None
+        self._key_image: Optional[Point] = None
+
+    @classmethod
+    def generate(cls) -> PrivateKey:
+        return cls(Scalar.random())
+
+    @classmethod
+    def from_private_bytes(cls, data: ByteString) -> PrivateKey:
+        return cls(Scalar(bytes(data)))
+
+    def public_key(self) -> PublicKey:
+        # Note that this is not a standard Ed25519 public key
+        # The regular method described in RFC8032 involves hashing
+        # the secret scalar and pruning bits.
+        # (c.f. https://tools.ietf.org/html/rfc8032#section-5.1.5 and
+        # https://github.com/openssl/openssl/blob/36e619d70f86f9dd52c57b6ac8a3bfea3c0a2745/crypto/ec/curve25519.c#L5544)
+        # but this destroys the associativity and distributivity
+        # properties needed for the ring construction
+        if self._public_key is None:
+            self._public_key = PublicKey(self.scalar * G)
+        return self._public_key
+
+    def key_image(self) -> Point:
+        if self._key_image is None:
+            self._key_image = self.scalar * self.public_key().point.hash_to_point()
+        return self._key_image
+
+
+class PublicKey:
+    __slots__ = ["point"]
+
+    def __init__(self, point: Point) -> None:
+        self.point = point
+
+
+@dataclasses.dataclass(frozen=True)
+class RingSignature:
+    """A ring signature.
+
+    A ring signature consists of the public keys the message was signed against, the
+    key image of the signer's public key, and the two rings.
+    """
+
+    public_keys: List[Point]
+    key_image: Point
+    c: List[Scalar]
+    r: List[Scalar]
+
+
+# The minimum number of ring members to hand to each thread
+_MIN_MEMBERS_PER_THREAD = 16
+
+
+def _ring_points(
+    buffer_: bytearray,
+    offset: int,
+    public_keys: List[Point],
+    r: List[Scalar],
+    c: List[Scalar],
+    I: Point,  # noqa: E741
+) -> None:
+    """Write the points that are hashed for the given ring members into a buffer.
+
+    For each member this computes r_i * G + c_i * P_i and r_i * H_p(P_i) + c_i * I
+    in C, using the precomputed tables of the hashed public keys and the key image.
+    The members are independent, so for large rings they are split over multiple
+    threads (CFFI releases the GIL while the C code runs).
+
+    Raises:
+        ValueError: If the key image or one of the public keys is not a valid point.
+    """
+    I.precompute()
+    n = len(public_keys)
+    num_threads = _num_threads(n)
+    if num_threads <= 1:
+        _ring_points_chunk(buffer_, offset, public_keys, r, c, I)
+        return
+    point_bytes = lib.crypto_core_ed25519_BYTES
+    bounds = [n * k // num_threads for k in range(num_threads + 1)]
+    with concurrent.futures.ThreadPoolExecutor(num_threads) as executor:
+        futures = [
+            executor.submit(
+                _ring_points_chunk,
+                buffer_,
+                offset + 2 * point_bytes * start,
+                public_keys[start:end],
+                r[start:end],
+                c[start:end],
+                I,
+            )
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+
+
+def _num_threads(n: int) -> int:
+    return min(os.cpu_count() or 1, n // _MIN_MEMBERS_PER_THREAD)
+
+
+def _ring_arguments(
+    public_keys: List[Point], r: List[Scalar], c: List[Scalar]
+) -> Tuple[bytes, bytes, bytes, ffi.CData]:
+    """Pack the ring members into the arrays expected by the C functions."""
+    hashed_tables = ffi.new(
+        "unsigned char *[]",
+        [P_i.hash_to_point().precompute()._table for P_i in public_keys],
+    )
+    return (
+        b"".join(ffi.buffer(r_i.data) for r_i in r),
+        b"".join(ffi.buffer(c_i.data) for c_i in c),
+        b"".join(ffi.buffer(P_i.data) for P_i in public_keys),
+        hashed_tables,
+    )
+
+
+def _ring_points_chunk(
+    buffer_: bytearray,
+    offset: int,
+    public_keys: List[Point],
+    r: List[Scalar],
+    c: List[Scalar],
+    I: Point,  # noqa: E741
+) -> None:
+    if not public_keys:
+        return
+    if lib.pyring_ring_points(
+        ffi.from_buffer(buffer_) + offset,
+        *_ring_arguments(public_keys, r, c),
+        I._table,
+        len(public_keys),
+    ):
+        raise ValueError("invalid point")
+
+
+def ring_sign(
+    message: ByteString, public_keys: List[Point], private_key: Scalar, key_index: int
+) -> RingSignature:
+    """Sign the given message.
+
+    As part of the signature generation, the public keys are shuffled so that the
+    ordering holds no information about the identity of the signer.
+
+    Args:
+        message: The message to sign.
+        public_keys: The public keys of the group to generate a ring signature of.
+        private_key: The secret key of the signer.
+        key_index: The index to the corresponding public key. Note that they key
+            index should be unpredictable; shuffle the public keys before generating
+            the ring signature if this is not the case.
+
+    Returns:
+        A ring signature.
+
+    Raises:
+        ValueError: If one of the public keys is not a valid point.
+    """
+    # We follow the notation from the CryptoNote white paper, section 4.4
+    x = private_key
+    s = key_index
+    I = PrivateKey(private_key).key_image()  # noqa: E741
+
+    def H_s(*data: ByteLike) -> Scalar:
+        return hash_chunks_to_scalar(data)
+
+    def H_p(point: Point) -> Point:
+        return point.hash_to_point()
+
+    # Preallocate the buffer for the two points of each ring member, which is
+    # hashed after the message
+    point_bytes = lib.crypto_core_ed25519_BYTES
+    offset = 0
+    buffer_ = bytearray(2 * point_bytes * len(public_keys))
+
+    # The other members' scalars end up in the signature, so they are public and
+    # variable time multiplication can be used; the signer's must be constant time
+    n = len(public_keys)
+    q_s, *scalars = Scalar.random_batch(2 * n - 1)
+    c, r = scalars[: n - 1], scalars[n - 1 :]
+    _ring_points(buffer_, offset, public_keys[:s], r[:s], c[:s], I)
+    offset += 2 * point_bytes * s
+    (q_s * G).write_into(buffer_, offset)
+    (q_s * H_p(public_keys[s])).write_into(buffer_, offset + point_bytes)
+    offset += 2 * point_bytes
+    _ring_points(buffer_, offset, public_keys[s + 1 :], r[s:], c[s:], I)
+    c.insert(s, H_s(message, buffer_) - Scalar.sum(c))
+    r.insert(s, Scalar.mulsub(c[s], x, q_s))
+
+    return RingSignature(public_keys, I, c, r)
+
+
+def ring_verify(message: ByteString, signature: RingSignature) -> bool:
+    """Verify that a signature is valid for the given message.
+
+    Args:
+        message: The message to verify the signature for.
+        signature: The ring signature to verify.
+    """
+    public_keys = signature.public_keys
+    I, c, r = signature.key_image, signature.c, signature.r
+
+    def H_s(*data: ByteLike) -> Scalar:
+        return hash_chunks_to_scalar(data)
+
+    if not len(public_keys) == len(c) == len(r):
+        return False
+
+    # Unless the work is split across threads, the ring members' points are hashed
+    # and the challenge checked in a single call
+    if _num_threads(len(public_keys)) <= 1:
+        try:
+            I.precompute()
+            arguments = _ring_arguments(public_keys, r, c)
+        except ValueError:
+            return False
+        result = lib.pyring_ring_verify(
+            ffi.from_buffer(message), len(message), *arguments, I._table, len(c)
+        )
+        return cast(bool, result == 0)
+
+    buffer_ = bytearray(2 * lib.crypto_core_ed25519_BYTES * len(public_keys))
+    try:
+        _ring_points(buffer_, 0, public_keys, r, c, I)
+    except ValueError:
+        return False
+
+    return H_s(message, buffer_) - Scalar.sum(c) == 0
+
+
+class RingBatch:
+    """A batch of ring signatures to verify.
+
+    Each ring member's points are hashed individually, so the verification of
+    multiple signatures cannot be combined into a single multi-scalar multiplication.
+    Instead, public keys and key images that appear in multiple signatures are
+    coalesced, so that each distinct point is hashed and precomputed only once.
+    """
+
+    __slots__ = ["_signatures", "_points"]
+
+    def __init__(self) -> None:
+        self._signatures: List[Tuple[ByteString, RingSignature]] = []
+        self._points: Dict[bytes, Point] = {}
+
+    def _coalesce(self, point: Point) -> Point:
+        return self._points.setdefault(point.as_bytes(), point)
+
+    def add(self, message: ByteString, signature: RingSignature) -> None:
+        """Add a signature and the message it signs to the batch."""
+        signature = dataclasses.replace(
+            signature,
+            public_keys=[self._coalesce(P_i) for P_i in signature.public_keys],
+            key_image=self._coalesce(signature.key_image),
+        )
+        self._signatures.append((message, signature))
+
+    def verify(self) -> bool:
+        """Verify that all the signatures in the batch are valid."""
+        return all(
+            ring_verify(message, signature) for message, signature in self._signatures
+        )
@@ -0,0 +1,309 @@
+# Copyright 2019 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Elliptic curve arithmetic.
+
+This module contains utitilities to perform as modular arithmetic on the prime
+field defined by the order of the Ed25519 curve (NB: not the order of the
+field that the curve is defined over).
+
+Attributes:
+    L: The order of the Ed25519 curve.
+"""
+from __future__ import annotations
+
+from typing import Any, ClassVar, Iterable, List, Sequence, Union, cast
+
+from .utils import as_array, as_array_readonly, as_array_scratch, ByteLike, UCHAR_ARRAY
+from ._sodium import ffi, lib
+
+L = 2 ** 252 + 27742317777372353535851937790883648493
+
+_UCHAR_PTR_ARRAY = ffi.typeof("unsigned char *[]")
+
+
+class Scalar:
+    """A scalar in a finite field.
+
+    Arithmetic between scalars is performed modulo L, where L = 2^252 + 2774... is the
+    prime order of the cyclic subgroup of curves Ed25519 and Curve25519. NB: This is not
+    the prime field that the curve is defined over, which has order 2^255 - 19!
+    Arithmetic is performed using libsodium.
+
+    Note that a scalar is not guaranteed to be less than L if it was not a result of
+    an arithmetic operation.
+
+    Attributes:
+        data: The FFI array storing the scalar. Numbers are stored as 32-byte
+            unsigned integers in little-endian format.
+        FAST_VARTIME: If true (the default), operations with the integers 0 and 1 skip
+            the call to libsodium when the result is known. This makes the time taken
+            depend on the value of the scalars, so it should be disabled when doing
+            arithmetic with secret scalars that can be 0 or 1.
+    """
+
+    __slots__ = ["data"]
+
+    FAST_VARTIME: ClassVar[bool] = True
+
+    def __init__(self, n: Union[ByteLike, int] = 0) -> None:
+        """Construct a scalar.
+
+        Args:
+            n: The 32-byte array or ffi array to initialize this scalar with. If an
+                integer is passed it will be converted to bytes (without applying the
+                modulo operator).
+        """
+        if isinstance(n, int):
+            n = n.to_bytes(lib.crypto_core_ed25519_SCALARBYTES, "little")
+        if len(n) != lib.crypto_core_ed25519_SCALARBYTES:
+            raise ValueError(
+                f"scalar must be {lib.crypto_core_ed25519_SCALARBYTES} bytes"
+            )
+        self.data = as_array(n)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({int(self)})"
+
+    @classmethod
+    def _new(cls) -> Scalar:
+        """Allocate a zero scalar to write the result of an operation into.
+
+        This avoids the conversion done by the constructor, which dominates the cost
+        of small operations.
+        """
+        out = cls.__new__(cls)
+        out.data = ffi.new(UCHAR_ARRAY, lib.crypto_core_ed25519_SCALARBYTES)
+        return out
+
+    @classmethod
+    def from_unreduced(cls, n: ByteLike) -> Scalar:
+        """Reduces a 64-byte scalar to a 32-byte scalar by applying mod L.
+
+        Returns:
+            A scalar in the range [0, ..., L - 1].
+        """
+        if len(n) != lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES:
+            raise ValueError(
+                "unreduced scalar must be "
+                f"{lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES} bytes"
+            )
+        out = cls._new()
+        lib.crypto_core_ed25519_scalar_reduce(out.data, as_array_readonly(n))
+        return out
+
+    @classmethod
+    def random(cls) -> Scalar:
+        """Construct a random scalar.
+
+        Returns:
+            A scalar in the range [1, ..., L - 1].
+        """
+        out = cls._new()
+        lib.crypto_core_ed25519_scalar_random(out.data)
+        return out
+
+    @classmethod
+    def random_batch(cls, n: int) -> List[Scalar]:
+        """Construct a list of random scalars.
+
+        The randomness for all scalars is drawn with a single call to the random
+        number generator, after which each 64-byte chunk is reduced.
+
+        Returns:
+            A list of n scalars in the range [0, ..., L - 1].
+        """
+        size = lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES
+        pool = ffi.new(UCHAR_ARRAY, size * n)
+        lib.randombytes_buf(pool, size * n)
+        scalars = []
+        for i in range(n):
+            out = cls._new()
+            lib.crypto_core_ed25519_scalar_reduce(out.data, pool + size * i)
+            scalars.append(out)
+        return scalars
+
+    @classmethod
+    def sum(cls, scalars: Iterable[Scalar]) -> Scalar:
+        """Sum a sequence of scalars modulo L using a single call to libsodium.
+
+        Returns:
+            A scalar in the range [0, ..., L - 1].
+        """
+        data = b"".join(ffi.buffer(scalar.data) for scalar in scalars)
+        out = cls._new()
+        lib.pyring_scalar_sum(
+            out.data, data, len(data) // lib.crypto_core_ed25519_SCALARBYTES
+        )
+        return out
+
+    @classmethod
+    def batch_add(cls, a: Sequence[Scalar], b: Sequence[Scalar]) -> List[Scalar]:
+        """Add two sequences of scalars elementwise using a single call to libsodium.
+
+        Returns:
+            A list of scalars in the range [0, ..., L - 1].
+        """
+        if len(a) != len(b):
+            raise ValueError("sequences of scalars must have the same length")
+        scalars = [cls._new() for _ in range(len(a))]
+        lib.pyring_scalar_batch_add(
+            ffi.new(_UCHAR_PTR_ARRAY, [out.data for out in scalars]),
+            ffi.new(_UCHAR_PTR_ARRAY, [scalar.data for scalar in a]),
+            ffi.new(_UCHAR_PTR_ARRAY, [scalar.data for scalar in b]),
+            len(a),
+        )
+        return scalars
+
+    @classmethod
+    def muladd(cls, a: Scalar, b: Scalar, c: Scalar) -> Scalar:
+        """Compute a * b + c modulo L using a single call to libsodium.
+
+        Returns:
+            A scalar in the range [0, ..., L - 1].
+        """
+        out = cls._new()
+        lib.pyring_scalar_muladd(out.data, a.data, b.data, c.data)
+        return out
+
+    @classmethod
+    def mulsub(cls, a: Scalar, b: Scalar, c: Scalar) -> Scalar:
+        """Compute c - a * b modulo L using a single call to libsodium.
+
+        Returns:
+            A scalar in the range [0, ..., L - 1].
+        """
+        out = cls._new()
+        lib.pyring_scalar_mulsub(out.data, a.data, b.data, c.data)
+        return out
+
+    def __int__(self) -> int:
+        return int.from_bytes(ffi.buffer(self.data), "little")
+
+    def _is_fast_identity(self) -> bool:
+        """Whether an operation with an identity element can return this scalar.
+
+        That is the case if it is known to be reduced: any scalar whose most
+        significant byte is less than 16 is less than 2^252 < L.
+        """
+        return Scalar.FAST_VARTIME and self.data[31] < 16
+
+    def __add__(self, other: ScalarLike) -> Scalar:
+        if isinstance(other, int):
+            if other == 0 and self._is_fast_identity():
+                return self
+            other_data = _int_array(other)
+        elif isinstance(other, Scalar):
+            other_data = other.data
+        else:
+            return NotImplemented
+        out = Scalar._new()
+        lib.crypto_core_ed25519_scalar_add(out.data, self.data, other_data)
+        return out
+
+    def __radd__(self, other: ScalarLike) -> Scalar:
+        return self + other
+
+    def __sub__(self, other: ScalarLike) -> Scalar:
+        if isinstance(other, int):
+            if other == 0 and self._is_fast_identity():
+                return self
+            other_data = _int_array(other)
+        elif isinstance(other, Scalar):
+            other_data = other.data
+        else:
+            return NotImplemented
+        out = Scalar._new()
+        lib.crypto_core_ed25519_scalar_sub(out.data, self.data, other_data)
+        return out
+
+    def __rsub__(self, other: ScalarLike) -> Scalar:
+        if isinstance(other, int):
+            other = Scalar(other)
+        elif not isinstance(other, Scalar):
+            return NotImplemented
+        return other - self
+
+    def __mul__(self, other: ScalarLike) -> Scalar:
+        """Multiply two scalars modulus L."""
+        if isinstance(other, int):
+            if other == 0 and Scalar.FAST_VARTIME:
+                return Scalar._new()
+            if other == 1 and self._is_fast_identity():
+                return self
+            other_data = _int_array(other)
+        elif isinstance(other, Scalar):
+            other_data = other.data
+        else:
+            return NotImplemented
+        out = Scalar._new()
+        lib.crypto_core_ed25519_scalar_mul(out.data, self.data, other_data)
+        return out
+
+    def __rmul__(self, other: ScalarLike) -> Scalar:
+        return self * other
+
+    def __truediv__(self, other: ScalarLike) -> Scalar:
+        """Divide two scalars.
+
+        Division is implemented as inversion followed by multiplication.
+        """
+        if isinstance(other, int):
+            if other == 1 and self._is_fast_identity():
+                return self
+            other_data = _int_array(other)
+        elif isinstance(other, Scalar):
+            other_data = other.data
+        else:
+            return NotImplemented
+        inverted = Scalar._new()
+        lib.crypto_core_ed25519_scalar_invert(inverted.data, other_data)
+        if Scalar.FAST_VARTIME and self == 1:
+            return inverted
+        return self * inverted
+
+    def __rtruediv__(self, other: ScalarLike) -> Scalar:
+        if isinstance(other, int):
+            other = Scalar(other)
+        elif not isinstance(other, Scalar):
+            return NotImplemented
+        return other / self
+
+    def __neg__(self) -> Scalar:
+        out = Scalar._new()
+        lib.crypto_core_ed25519_scalar_negate(out.data, self.data)
+        return out
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, int):
+            return int(self) == other
+        elif isinstance(other, Scalar):
+            # Scalars can be secret, so they are compared in constant time
+            result = lib.sodium_memcmp(
+                self.data, other.data, lib.crypto_core_ed25519_SCALARBYTES
+            )
+            return cast(bool, result == 0)
+        else:
+            return False
+
+
+def _int_array(n: int) -> ffi.CData:
+    """Convert an integer operand into a temporary array (see `as_array_scratch`)."""
+    return as_array_scratch(
+        n.to_bytes(lib.crypto_core_ed25519_SCALARBYTES, "little"),
+        lib.crypto_core_ed25519_SCALARBYTES,
+    )
+
+
+ScalarLike = Union[Scalar, int]
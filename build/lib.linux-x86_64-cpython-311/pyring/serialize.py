@@ -0,0 +1,121 @@
+# Copyright 2019 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import string
+import uuid
+from typing import Iterable
+
+import pyasn1.codec.der.encoder
+import pyasn1.codec.der.decoder
+from pyasn1.type.namedtype import NamedType, NamedTypes
+from pyasn1.type.univ import Sequence, SequenceOf, OctetString, ObjectIdentifier
+
+from .ge import Point
+from .sc25519 import Scalar
+from .one_time import RingSignature
+from ._sodium import ffi
+
+
+_PEM_OPENING = "-----BEGIN RING SIGNATURE-----"
+_PEM_CLOSING = "-----END RING SIGNATURE-----"
+_UUID = uuid.UUID(hex="3b5e61af-c4ec-496e-95e9-4b64bccdc809")
+_OBJECT_ID = (2, 25) + tuple(_UUID.bytes)
+
+
+class RingSignatureSchema(Sequence):
+    """An ASN.1 schema for ring signatures.
+
+    Ring signatures are identified with an object ID following Recommendation
+    ITU-T X.667. The UUID4 used is 3b5e61af-c4ec-496e-95e9-4b64bccdc809.
+    """
+
+    componentType = NamedTypes(
+        NamedType("algorithm", ObjectIdentifier(value=_OBJECT_ID)),
+        NamedType("key_image", OctetString()),
+        NamedType("public_keys", SequenceOf(componentType=OctetString())),
+        NamedType("c", SequenceOf(componentType=OctetString())),
+        NamedType("r", SequenceOf(componentType=OctetString())),
+    )
+
+
+def _der_header(tag: int, length: int) -> bytes:
+    """Encode the identifier and length octets of a DER element."""
+    if length < 0x80:
+        return bytes([tag, length])
+    length_octets = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([tag, 0x80 | len(length_octets)]) + length_octets
+
+
+_SEQUENCE_TAG = 0x30
+_OCTET_STRING_TAG = 0x04
+_OBJECT_ID_DER = pyasn1.codec.der.encoder.encode(ObjectIdentifier(_OBJECT_ID))
+# Points and scalars are all 32 bytes, so each octet string has the same header
+_ELEMENT_HEADER = _der_header(_OCTET_STRING_TAG, 32)
+
+
+def _der_sequence_of(elements: Iterable[ffi.CData]) -> bytes:
+    """Encode a sequence of 32-byte arrays as a DER SEQUENCE OF OCTET STRING."""
+    body = b"".join(_ELEMENT_HEADER + ffi.buffer(element)[:] for element in elements)
+    return _der_header(_SEQUENCE_TAG, len(body)) + body
+
+
+def export_pem(ring_signature: RingSignature) -> str:
+    """Export the ring signature to a PEM file.
+
+    The DER encoding follows `RingSignatureSchema`, but because the layout is fixed
+    apart from the number of ring members it is written directly.
+    """
+    body = b"".join(
+        [
+            _OBJECT_ID_DER,
+            _ELEMENT_HEADER,
+            ffi.buffer(ring_signature.key_image.data)[:],
+            _der_sequence_of([P.data for P in ring_signature.public_keys]),
+            _der_sequence_of([c.data for c in ring_signature.c]),
+            _der_sequence_of([r.data for r in ring_signature.r]),
+        ]
+    )
+    der = _der_header(_SEQUENCE_TAG, len(body)) + body
+    # Base64 has no whitespace, so the lines can be sliced instead of using textwrap
+    encoded = base64.b64encode(der).decode("ascii")
+    der_base64 = "\n".join(encoded[i : i + 64] for i in range(0, len(encoded), 64))
+    return f"{_PEM_OPENING}\n{der_base64}\n{_PEM_CLOSING}"
+
+
+def import_pem(signature: str) -> RingSignature:
+    signature = signature.strip()
+    if not signature.startswith(_PEM_OPENING) or not signature.endswith(_PEM_CLOSING):
+        raise ValueError("invalid encapsulation")
+    # Strip opening/closing and remove whitespace
+    signature = signature[len(_PEM_OPENING) : -len(_PEM_CLOSING)]
+    signature = signature.translate({ord(c): None for c in string.whitespace})
+
+    # Decode from text to ASN.1 object
+    der = base64.b64decode(signature, validate=True)
+    asn1, remainder = pyasn1.codec.der.decoder.decode(der)
+    if remainder:
+        raise ValueError("unable to decode entire signature")
+
+    # Check if the object identifier is correct
+    if asn1["field-0"] != _OBJECT_ID:
+        raise ValueError("invalid object ID")
+
+    # Extract data
+    key_image = Point(asn1["field-1"])
+    public_keys = [Point(public_key) for public_key in asn1["field-2"]]
+    cs = [Scalar(c) for c in asn1["field-3"]]
+    rs = [Scalar(r) for r in asn1["field-4"]]
+
+    return RingSignature(public_keys, key_image, cs, rs)
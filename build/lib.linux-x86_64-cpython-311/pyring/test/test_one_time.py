@@ -0,0 +1,117 @@
+# Copyright 2019 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import dataclasses
+import os
+import random
+
+import pytest
+
+from pyring import one_time
+from pyring.ge import O, Point
+from pyring.one_time import PrivateKey, RingBatch, ring_sign, ring_verify
+from pyring.sc25519 import Scalar
+
+
+def test_keys():
+    private_key = PrivateKey.generate()
+    public_key = private_key.public_key()
+    assert public_key.point.is_valid()
+    key_image = private_key.scalar * public_key.point.hash_to_point()
+    assert private_key.key_image() == key_image
+
+    private_key = PrivateKey.from_private_bytes(bytes(Scalar.random().data))
+
+
+def test_one_time():
+    num_keys = 100
+    signer_index = 0
+    # Let each user sign
+    public_keys = []
+    # Generate keys
+    for key_index in range(num_keys):
+        private_key = PrivateKey.generate()
+        public_key = private_key.public_key()
+        public_keys.append(public_key.point)
+        if key_index == signer_index:
+            signer_key = private_key
+
+    message = os.urandom(random.randint(1, 500))
+    signature = ring_sign(message, public_keys, signer_key.scalar, signer_index)
+
+    # Check the signature works
+    assert len(signature.c) == num_keys
+    assert len(signature.r) == num_keys
+    assert len(signature.public_keys) == num_keys
+
+    assert ring_verify(message, signature)
+    assert ring_verify(bytearray(message), signature)
+
+    # Check it does not work for other messages and such
+    assert not ring_verify(message + b"0", signature)
+    wrong_public_keys = dataclasses.replace(signature, public_keys=public_keys[::-1])
+    assert not ring_verify(message, wrong_public_keys)
+    wrong_image = dataclasses.replace(signature, key_image=2 * signature.key_image)
+    assert not ring_verify(message, wrong_image)
+    invalid_image = dataclasses.replace(signature, key_image=O)
+    assert not ring_verify(message, invalid_image)
+    missing_key = dataclasses.replace(signature, public_keys=public_keys[1:])
+    assert not ring_verify(message, missing_key)
+    signature.c[0] += 1
+    assert not ring_verify(message, signature)
+
+
+def test_invalid_public_key():
+    private_key = PrivateKey.generate()
+    public_keys = [private_key.public_key().point, O]
+    with pytest.raises(ValueError):
+        ring_sign(b"message", public_keys, private_key.scalar, 0)
+
+
+def test_single_key():
+    private_key = PrivateKey.generate()
+    public_keys = [private_key.public_key().point]
+    signature = ring_sign(b"message", public_keys, private_key.scalar, 0)
+    assert ring_verify(b"message", signature)
+
+
+def test_threads(monkeypatch):
+    monkeypatch.setattr(one_time.os, "cpu_count", lambda: 4)
+    private_keys = [PrivateKey.generate() for _ in range(50)]
+    public_keys = [private_key.public_key().point for private_key in private_keys]
+    signature = ring_sign(b"message", public_keys, private_keys[10].scalar, 10)
+
+    monkeypatch.setattr(one_time.os, "cpu_count", lambda: 1)
+    assert ring_verify(b"message", signature)
+    monkeypatch.setattr(one_time.os, "cpu_count", lambda: 3)
+    assert ring_verify(b"message", signature)
+    assert not ring_verify(b"other message", signature)
+
+
+def test_batch():
+    private_keys = [PrivateKey.generate() for _ in range(10)]
+    public_keys = [private_key.public_key().point for private_key in private_keys]
+
+    batch = RingBatch()
+    assert batch.verify()
+    for i in range(5):
+        # Use copies of the points, as if the signatures were deserialized
+        ring = [Point(P.as_bytes()) for P in public_keys[i : i + 5]]
+        message = os.urandom(100)
+        signature = ring_sign(message, ring, private_keys[i].scalar, 0)
+        batch.add(message, signature)
+    assert batch.verify()
+
+    batch.add(b"message", signature)
+    assert not batch.verify()
@@ -0,0 +1,148 @@
+# Copyright 2019 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from pyring._sodium import ffi, lib
+from pyring.sc25519 import Scalar, L
+
+
+def test_sc_constructors():
+    data = ffi.new("unsigned char[]", lib.crypto_core_ed25519_SCALARBYTES)
+    data[0] = 3
+    assert Scalar(data) == 3
+
+    assert Scalar(3) == 3
+
+    nonreduced = (L + 3).to_bytes(
+        lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES, "little"
+    )
+    assert Scalar.from_unreduced(nonreduced) == 3
+
+    assert 0 < int(Scalar.random()) < L
+    scalars = Scalar.random_batch(10)
+    assert len(scalars) == 10
+    assert all(0 <= int(x) < L for x in scalars)
+    assert len({int(x) for x in scalars}) == 10
+
+    assert Scalar(L + 1) == L + 1
+    assert Scalar(L + 1) + 0 == 1
+
+    with pytest.raises(ValueError):
+        Scalar(b"0" * (lib.crypto_core_ed25519_SCALARBYTES - 1))
+
+    with pytest.raises(ValueError):
+        Scalar.from_unreduced(
+            b"0" * (lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES - 1)
+        )
+
+
+def test_sc_sum():
+    scalars = [Scalar.random() for _ in range(10)]
+    assert Scalar.sum(scalars) == sum(int(x) for x in scalars) % L
+    assert Scalar.sum([Scalar(L + 1), Scalar(L - 1)]) == 0
+    assert Scalar.sum([]) == 0
+
+
+def test_sc_batch_add():
+    a = [Scalar.random() for _ in range(10)]
+    b = [Scalar.random() for _ in range(10)]
+    assert Scalar.batch_add(a, b) == [x + y for x, y in zip(a, b)]
+    assert Scalar.batch_add([], []) == []
+    with pytest.raises(ValueError):
+        Scalar.batch_add(a, b[1:])
+
+
+def test_sc_muladd():
+    a, b, c = Scalar.random(), Scalar.random(), Scalar.random()
+    assert Scalar.muladd(a, b, c) == (int(a) * int(b) + int(c)) % L
+    assert Scalar.mulsub(a, b, c) == (int(c) - int(a) * int(b)) % L
+    assert Scalar.mulsub(a, b, c) == c - a * b
+
+
+def test_sc_fast_vartime(monkeypatch):
+    x = Scalar(L - 2)
+    y = Scalar(3)
+    assert x + 0 == x and y + 0 is y
+    assert x - 0 == x and y - 0 is y
+    assert x * 1 == x and y * 1 is y
+    assert x / 1 == x and y / 1 is y
+    assert x * 0 == 0 and 0 * y == 0
+    assert Scalar(L + 1) * 1 == 1
+
+    monkeypatch.setattr(Scalar, "FAST_VARTIME", False)
+    assert y + 0 is not y
+    assert y * 1 is not y
+    assert y * 0 == 0
+
+
+def test_sc_repr():
+    x = Scalar.random()
+    assert eval(repr(x)) == x
+
+
+def test_sc_arithmetic():
+    x = Scalar(L - 2)
+    y = Scalar(1)
+    z = Scalar(4)
+
+    assert x + y == L - 1
+    assert x + x == L - 4
+    assert x + 1 == L - 1
+    assert x + 3 == y
+    assert 1 + x == x + 1
+
+    assert x - y == L - 3
+    assert y - x == 3
+    assert x - 2 == L - 4
+    assert y - 3 == x
+    assert 3 - y == -x
+
+    assert -x == 2
+    assert -y == L - 1
+
+    assert x * 2 == L - 4
+    assert y * x == x
+    assert y * 3 == 3
+    assert 2 * x == L - 4
+
+    assert (1 / y) * y == 1
+    assert (y / 2) * 2 == 1
+    assert (y / y) * y == 1
+
+    assert (1 / x) * x == 1
+    assert x / 1 == x
+    assert x / z * z == x
+    assert (z / x) * x == z
+
+    assert x != x + 1
+    assert x != object()
+
+    f = 2.3
+    with pytest.raises(TypeError):
+        x + f
+    with pytest.raises(TypeError):
+        f + x
+    with pytest.raises(TypeError):
+        x - f
+    with pytest.raises(TypeError):
+        f - x
+    with pytest.raises(TypeError):
+        x / f
+    with pytest.raises(TypeError):
+        f / x
+    with pytest.raises(TypeError):
+        f * x
+    with pytest.raises(TypeError):
+        x * f
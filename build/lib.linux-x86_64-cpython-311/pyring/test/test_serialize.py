@@ -0,0 +1,49 @@
+# Copyright 2019 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+
+import pyasn1.codec.der.encoder
+import pyasn1.codec.native.decoder
+
+from pyring.one_time import PrivateKey, ring_sign, ring_verify
+from pyring.serialize import RingSignatureSchema, export_pem, import_pem
+
+
+def test_serialize():
+    private_keys = [PrivateKey.generate() for _ in range(200)]
+    public_keys = [private_key.public_key().point for private_key in private_keys]
+    signature = ring_sign(b"message", public_keys, private_keys[3].scalar, 3)
+    imported = import_pem(export_pem(signature))
+    assert imported == signature
+    assert ring_verify(b"message", imported)
+
+
+def test_export_der():
+    private_keys = [PrivateKey.generate() for _ in range(5)]
+    public_keys = [private_key.public_key().point for private_key in private_keys]
+    signature = ring_sign(b"message", public_keys, private_keys[0].scalar, 0)
+    der = pyasn1.codec.der.encoder.encode(
+        pyasn1.codec.native.decoder.decode(
+            {
+                "key_image": signature.key_image.as_bytes(),
+                "public_keys": [P.as_bytes() for P in signature.public_keys],
+                "c": [bytes(c.data) for c in signature.c],
+                "r": [bytes(r.data) for r in signature.r],
+            },
+            asn1Spec=RingSignatureSchema(),
+        )
+    )
+    pem = export_pem(signature).splitlines()
+    assert base64.b64decode("".join(pem[1:-1])) == der
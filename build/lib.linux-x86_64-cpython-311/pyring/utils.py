@@ -0,0 +1,100 @@
+# Copyright 2019 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+from typing import Dict, Union
+
+from ._sodium import ffi
+
+
+ByteLike = Union[ffi.CData, collections.abc.ByteString]
+
+# Looking up the type once saves parsing the type string on every allocation
+UCHAR_ARRAY = ffi.typeof("unsigned char[]")
+
+
+def as_array(data: ByteLike) -> ffi.CData:
+    """Convert a bytes-like object into an FFI-array.
+
+    Args:
+        data: An object supporting the buffer protocol, or otherwise an object that
+            can be converted to bytes (e.g. a sequence of integers). If an FFI array
+            is passed, it will be returned as is.
+
+    Returns:
+        An FFI `CData` array with the given value.
+
+    """
+    if isinstance(data, ffi.CData):
+        return data
+    n = len(data)
+    array = ffi.new(UCHAR_ARRAY, n)
+    try:
+        ffi.memmove(array, data, n)
+    except TypeError:
+        ffi.memmove(array, bytes(data), n)
+    return array
+
+
+def as_array_readonly(data: ByteLike) -> ffi.CData:
+    """Convert a bytes-like object into an FFI-array without copying it if possible.
+
+    The returned array can point directly into the memory of `data`, so it should
+    only be passed to functions that read from it (i.e. take a `const` pointer) and
+    it must not outlive `data`.
+
+    Args:
+        data: A bytes-like object. Objects that don't support the buffer protocol
+            are copied using `as_array`.
+
+    Returns:
+        An FFI `CData` array with the given value.
+
+    """
+    if isinstance(data, ffi.CData):
+        return data
+    try:
+        return ffi.from_buffer(UCHAR_ARRAY, data)
+    except TypeError:
+        return as_array(data)
+
+
+_scratch = threading.local()
+
+
+def as_array_scratch(data: ByteLike, size: int) -> ffi.CData:
+    """Copy a bytes-like object into a reusable FFI-array.
+
+    Each thread has one array for each size, so no memory is allocated. The array
+    is overwritten by the next call with the same size, so it should only be passed
+    to a function that doesn't keep a reference to it, and it must not be used
+    after another call to this function.
+
+    Args:
+        data: A bytes-like object of the given size.
+        size: The size of the data in bytes.
+
+    Returns:
+        An FFI `CData` array with the given value.
+
+    """
+    if len(data) != size:
+        raise ValueError(f"data must be {size} bytes")
+    buffers: Dict[int, ffi.CData] = _scratch.__dict__.setdefault("buffers", {})
+    array = buffers.get(size)
+    if array is None:
+        array = buffers[size] = ffi.new(UCHAR_ARRAY, size)
+    ffi.memmove(array, data, size)
+    return array
@@ -14,20 +14,24 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import dataclasses
-import functools
-import operator
-from typing import ByteString, List
+import os
+from typing import ByteString, Dict, List, Optional, Tuple
 
-from .ge import Point, G, hash_to_scalar
+from .ge import Point, G, hash_chunks_to_scalar
 from .sc25519 import Scalar
+from .utils import ByteLike
+from ._sodium import ffi, lib
 
 
 class PrivateKey:
-    __slots__ = ["scalar"]
+    __slots__ = ["scalar", "_public_key", "_key_image"]
 
     def __init__(self, scalar: Scalar) -> None:
         self.scalar = scalar
+        self._public_key: Optional[PublicKey] = None
+        self._key_image: Optional[Point] = None
 
     @classmethod
     def generate(cls) -> PrivateKey:
@@ -45,10 +49,14 @@ class PrivateKey:
         # https://github.com/openssl/openssl/blob/36e619d70f86f9dd52c57b6ac8a3bfea3c0a2745/crypto/ec/curve25519.c#L5544)
         # but this destroys the associativity and distributivity
         # properties needed for the ring construction
-        return PublicKey(self.scalar * G)
+        if self._public_key is None:
+            self._public_key = PublicKey(self.scalar * G)
+        return self._public_key
 
     def key_image(self) -> Point:
-        return self.scalar * self.public_key().point.hash_to_point()
+        if self._key_image is None:
+            self._key_image = self.scalar * self.public_key().point.hash_to_point()
+        return self._key_image
 
 
 class PublicKey:
@@ -72,6 +80,100 @@ class RingSignature:
     r: List[Scalar]
 
 
+# The minimum number of ring members to hand to each thread
+_MIN_MEMBERS_PER_THREAD = 16
+
+
+def _ring_points(
+    buffer_: bytearray,
+    offset: int,
+    public_keys: List[Point],
+    r: List[Scalar],
+    c: List[Scalar],
+    I: Point,  # noqa: E741
+) -> None:
+    """Write the points that are hashed for the given ring members into a buffer.
+
+    For each member this computes r_i * G + c_i * P_i and r_i * H_p(P_i) + c_i * I
+    in C, using the precomputed tables of the hashed public keys and the key image.
+    The members are independent, so for large rings they are split over multiple
+    threads (CFFI releases the GIL while the C code runs).
+
+    Raises:
+        ValueError: If the key image or one of the public keys is not a valid point.
+    """
+    # The tables are cached on the points, so fill the caches before any work is
+    # handed to other threads, which then only read them
+    I.precompute()
+    for P_i in public_keys:
+        P_i.hash_to_point().precompute()
+    n = len(public_keys)
+    num_threads = min(os.cpu_count() or 1, n // _MIN_MEMBERS_PER_THREAD)
+    if num_threads <= 1:
+        _ring_points_chunk(buffer_, offset, public_keys, r, c, I)
+        return
+    point_bytes = lib.crypto_core_ed25519_BYTES
+    bounds = [n * k // num_threads for k in range(num_threads + 1)]
+    with concurrent.futures.ThreadPoolExecutor(num_threads) as executor:
+        futures = [
+            executor.submit(
+                _ring_points_chunk,
+                buffer_,
+                offset + 2 * point_bytes * start,
+                public_keys[start:end],
+                r[start:end],
+                c[start:end],
+                I,
+            )
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+
+
+def _ring_arguments(
+    public_keys: List[Point], r: List[Scalar], c: List[Scalar]
+) -> Tuple[Tuple[bytes, bytes, bytes, ffi.CData], List[ffi.CData]]:
+    """Pack the ring members into the arrays expected by the C functions.
+
+    The array of hashed tables only holds pointers, so the tables it points to are
+    returned as well. They must be kept alive until the C function returns.
+
+    Raises:
+        ValueError: If the number of public keys and scalars differ.
+    """
+    if not len(public_keys) == len(r) == len(c):
+        raise ValueError("number of public keys and scalars must be equal")
+    tables = [P_i.hash_to_point().precompute()._table for P_i in public_keys]
+    arguments = (
+        b"".join(ffi.buffer(r_i.data) for r_i in r),
+        b"".join(ffi.buffer(c_i.data) for c_i in c),
+        b"".join(ffi.buffer(P_i.data) for P_i in public_keys),
+        ffi.new("unsigned char *[]", tables),
+    )
+    return arguments, tables
+
+
+def _ring_points_chunk(
+    buffer_: bytearray,
+    offset: int,
+    public_keys: List[Point],
+    r: List[Scalar],
+    c: List[Scalar],
+    I: Point,  # noqa: E741
+) -> None:
+    if not public_keys:
+        return
+    # Another thread can replace the tables cached on the points, so hold on to the
+    # ones that are passed until the call returns
+    arguments, tables = _ring_arguments(public_keys, r, c)
+    if lib.pyring_ring_points(
+        ffi.from_buffer(buffer_) + offset, *arguments, I._table, len(public_keys)
+    ):
+        raise ValueError("invalid point")
+    del tables
+
+
 def ring_sign(
     message: ByteString, public_keys: List[Point], private_key: Scalar, key_index: int
 ) -> RingSignature:
@@ -90,34 +192,45 @@ def ring_sign(
 
     Returns:
         A ring signature.
+
+    Raises:
+        IndexError: If the key index is out of range.
+        ValueError: If one of the public keys is not a valid point.
     """
+    if not 0 <= key_index < len(public_keys):
+        raise IndexError("key index out of range")
+
     # We follow the notation from the CryptoNote white paper, section 4.4
     x = private_key
     s = key_index
     I = PrivateKey(private_key).key_image()  # noqa: E741
-    H_s = hash_to_scalar
+
+    def H_s(*data: ByteLike) -> Scalar:
+        return hash_chunks_to_scalar(data)
 
     def H_p(point: Point) -> Point:
         return point.hash_to_point()
 
-    buffer_ = bytearray(message)
-
-    c = []
-    r = []
-    for i, P_i in enumerate(public_keys):
-        if i == key_index:
-            q_s = Scalar.random()
-            buffer_ += (q_s * G).as_bytes()
-            buffer_ += (q_s * H_p(P_i)).as_bytes()
-        else:
-            q_i = Scalar.random()
-            w_i = Scalar.random()
-            c.append(w_i)
-            r.append(q_i)
-            buffer_ += (q_i * G + w_i * P_i).as_bytes()
-            buffer_ += (q_i * H_p(P_i) + w_i * I).as_bytes()
-    c.insert(s, H_s(buffer_) - functools.reduce(operator.add, c))
-    r.insert(s, q_s - c[s] * x)
+    # The other members' scalars end up in the signature, so they are public and
+    # variable time multiplication can be used; the signer's must be constant time
+    n = len(public_keys)
+    q_s, *scalars = Scalar.random_batch(2 * n - 1)
+    c, r = scalars[: n - 1], scalars[n - 1 :]
+
+    # The points of the other members are computed in a single call, so that the
+    # work (and how it is split over threads) doesn't depend on the signer's index
+    point_bytes = lib.crypto_core_ed25519_BYTES
+    decoys = bytearray(2 * point_bytes * (n - 1))
+    _ring_points(decoys, 0, public_keys[:s] + public_keys[s + 1 :], r, c, I)
+    signer = bytearray(2 * point_bytes)
+    (q_s * G).write_into(signer, 0)
+    (q_s * H_p(public_keys[s])).write_into(signer, point_bytes)
+
+    # The points are hashed in the order of the ring members
+    view = memoryview(decoys)
+    split = 2 * point_bytes * s
+    c.insert(s, H_s(message, view[:split], signer, view[split:]) - Scalar.sum(c))
+    r.insert(s, Scalar.mulsub(c[s], x, q_s))
 
     return RingSignature(public_keys, I, c, r)
 
@@ -131,14 +244,51 @@ def ring_verify(message: ByteString, signature: RingSignature) -> bool:
     """
     public_keys = signature.public_keys
     I, c, r = signature.key_image, signature.c, signature.r
-    H_s = hash_to_scalar
 
-    def H_p(point: Point) -> Point:
-        return point.hash_to_point()
+    def H_s(*data: ByteLike) -> Scalar:
+        return hash_chunks_to_scalar(data)
+
+    if not len(public_keys) == len(c) == len(r):
+        return False
+
+    buffer_ = bytearray(2 * lib.crypto_core_ed25519_BYTES * len(public_keys))
+    try:
+        _ring_points(buffer_, 0, public_keys, r, c, I)
+    except ValueError:
+        return False
 
-    buffer_ = bytearray(message)
-    for i, (P_i, r_i, c_i) in enumerate(zip(public_keys, r, c)):
-        buffer_ += (r_i * G + c_i * P_i).as_bytes()
-        buffer_ += (r_i * H_p(P_i) + c_i * I).as_bytes()
+    return H_s(message, buffer_) - Scalar.sum(c) == 0
+
+
+class RingBatch:
+    """A batch of ring signatures to verify.
+
+    Each ring member's points are hashed individually, so the verification of
+    multiple signatures cannot be combined into a single multi-scalar multiplication.
+    Instead, public keys and key images that appear in multiple signatures are
+    coalesced, so that each distinct point is hashed and precomputed only once.
+    """
 
-    return H_s(buffer_) - functools.reduce(operator.add, c) == 0
+    __slots__ = ["_signatures", "_points"]
+
+    def __init__(self) -> None:
+        self._signatures: List[Tuple[ByteString, RingSignature]] = []
+        self._points: Dict[bytes, Point] = {}
+
+    def _coalesce(self, point: Point) -> Point:
+        return self._points.setdefault(point.as_bytes(), point)
+
+    def add(self, message: ByteString, signature: RingSignature) -> None:
+        """Add a signature and the message it signs to the batch."""
+        signature = dataclasses.replace(
+            signature,
+            public_keys=[self._coalesce(P_i) for P_i in signature.public_keys],
+            key_image=self._coalesce(signature.key_image),
+        )
+        self._signatures.append((message, signature))
+
+    def verify(self) -> bool:
+        """Verify that all the signatures in the batch are valid."""
+        return all(
+            ring_verify(message, signature) for message, signature in self._signatures
+        )
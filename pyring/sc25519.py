@@ -23,13 +23,17 @@ Attributes:
 """
 from __future__ import annotations
 
-from typing import Any, Union
+from typing import Any, ClassVar, Iterable, List, Sequence, Union, cast
 
-from .utils import as_array, ByteLike
-from ._sodium import lib
+from .utils import as_array, as_array_readonly, ByteLike, UCHAR_ARRAY
+from ._sodium import ffi, lib
 
 L = 2 ** 252 + 27742317777372353535851937790883648493
 
+_UCHAR_PTR_ARRAY = ffi.typeof("unsigned char *[]")
+# Integers in this range can be stored in a scalar without being reduced
+_INT_BOUND = 2 ** (8 * lib.crypto_core_ed25519_SCALARBYTES)
+
 
 class Scalar:
     """A scalar in a finite field.
@@ -45,10 +49,21 @@ class Scalar:
     Attributes:
         data: The FFI array storing the scalar. Numbers are stored as 32-byte
             unsigned integers in little-endian format.
+        FAST_VARTIME: If true, operations with the integers 0 and 1 skip the call to
+            libsodium when the result is known. This makes the time taken depend on
+            the value of the scalars, so it is disabled by default and should only be
+            enabled when all scalars that arithmetic is done with are public.
+        ZERO: The scalar 0. Operations with this instance are short-circuited the
+            same way as operations with the integer 0. It must not be modified.
+        ONE: The scalar 1, see `ZERO`.
     """
 
     __slots__ = ["data"]
 
+    FAST_VARTIME: ClassVar[bool] = False
+    ZERO: ClassVar[Scalar]
+    ONE: ClassVar[Scalar]
+
     def __init__(self, n: Union[ByteLike, int] = 0) -> None:
         """Construct a scalar.
 
@@ -68,6 +83,17 @@ class Scalar:
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({int(self)})"
 
+    @classmethod
+    def _new(cls) -> Scalar:
+        """Allocate a zero scalar to write the result of an operation into.
+
+        This avoids the conversion done by the constructor, which dominates the cost
+        of small operations.
+        """
+        out = cls.__new__(cls)
+        out.data = ffi.new(UCHAR_ARRAY, lib.crypto_core_ed25519_SCALARBYTES)
+        return out
+
     @classmethod
     def from_unreduced(cls, n: ByteLike) -> Scalar:
         """Reduces a 64-byte scalar to a 32-byte scalar by applying mod L.
@@ -80,8 +106,8 @@ class Scalar:
                 "unreduced scalar must be "
                 f"{lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES} bytes"
             )
-        out = cls()
-        lib.crypto_core_ed25519_scalar_reduce(out.data, as_array(n))
+        out = cls._new()
+        lib.crypto_core_ed25519_scalar_reduce(out.data, as_array_readonly(n))
         return out
 
     @classmethod
@@ -91,32 +117,126 @@ class Scalar:
         Returns:
             A scalar in the range [1, ..., L - 1].
         """
-        out = cls()
+        out = cls._new()
         lib.crypto_core_ed25519_scalar_random(out.data)
         return out
 
+    @classmethod
+    def random_batch(cls, n: int) -> List[Scalar]:
+        """Construct a list of random scalars.
+
+        The randomness for all scalars is drawn with a single call to the random
+        number generator, after which each 64-byte chunk is reduced.
+
+        Returns:
+            A list of n scalars in the range [0, ..., L - 1].
+        """
+        size = lib.crypto_core_ed25519_NONREDUCEDSCALARBYTES
+        pool = ffi.new(UCHAR_ARRAY, size * n)
+        lib.randombytes_buf(pool, size * n)
+        scalars = []
+        for i in range(n):
+            out = cls._new()
+            lib.crypto_core_ed25519_scalar_reduce(out.data, pool + size * i)
+            scalars.append(out)
+        return scalars
+
+    @classmethod
+    def sum(cls, scalars: Iterable[Scalar]) -> Scalar:
+        """Sum a sequence of scalars modulo L using a single call to libsodium.
+
+        Returns:
+            A scalar in the range [0, ..., L - 1].
+        """
+        data = b"".join(ffi.buffer(scalar.data) for scalar in scalars)
+        out = cls._new()
+        lib.pyring_scalar_sum(
+            out.data, data, len(data) // lib.crypto_core_ed25519_SCALARBYTES
+        )
+        return out
+
+    @classmethod
+    def batch_add(cls, a: Sequence[Scalar], b: Sequence[Scalar]) -> List[Scalar]:
+        """Add two sequences of scalars elementwise using a single call to libsodium.
+
+        Returns:
+            A list of scalars in the range [0, ..., L - 1].
+        """
+        if len(a) != len(b):
+            raise ValueError("sequences of scalars must have the same length")
+        scalars = [cls._new() for _ in range(len(a))]
+        lib.pyring_scalar_batch_add(
+            ffi.new(_UCHAR_PTR_ARRAY, [out.data for out in scalars]),
+            ffi.new(_UCHAR_PTR_ARRAY, [scalar.data for scalar in a]),
+            ffi.new(_UCHAR_PTR_ARRAY, [scalar.data for scalar in b]),
+            len(a),
+        )
+        return scalars
+
+    @classmethod
+    def muladd(cls, a: Scalar, b: Scalar, c: Scalar) -> Scalar:
+        """Compute a * b + c modulo L using a single call to libsodium.
+
+        Returns:
+            A scalar in the range [0, ..., L - 1].
+        """
+        out = cls._new()
+        lib.pyring_scalar_muladd(out.data, a.data, b.data, c.data)
+        return out
+
+    @classmethod
+    def mulsub(cls, a: Scalar, b: Scalar, c: Scalar) -> Scalar:
+        """Compute c - a * b modulo L using a single call to libsodium.
+
+        Returns:
+            A scalar in the range [0, ..., L - 1].
+        """
+        out = cls._new()
+        lib.pyring_scalar_mulsub(out.data, a.data, b.data, c.data)
+        return out
+
     def __int__(self) -> int:
-        return int.from_bytes(bytes(self.data), "little")
+        return int.from_bytes(ffi.buffer(self.data), "little")
+
+    def _is_fast_identity(self) -> bool:
+        """Whether an operation with an identity element can return this scalar.
+
+        That is the case if it is known to be reduced: any scalar whose most
+        significant byte is less than 16 is less than 2^252 < L.
+        """
+        return Scalar.FAST_VARTIME and self.data[31] < 16
 
     def __add__(self, other: ScalarLike) -> Scalar:
-        if isinstance(other, int):
-            other = Scalar(other)
-        elif not isinstance(other, Scalar):
+        if isinstance(other, Scalar):
+            if other is Scalar.ZERO and self._is_fast_identity():
+                return self
+            other_data = other.data
+        elif isinstance(other, int):
+            if other == 0 and self._is_fast_identity():
+                return self
+            other_data = _int_array(other)
+        else:
             return NotImplemented
-        out = Scalar()
-        lib.crypto_core_ed25519_scalar_add(out.data, self.data, other.data)
+        out = Scalar._new()
+        lib.crypto_core_ed25519_scalar_add(out.data, self.data, other_data)
         return out
 
     def __radd__(self, other: ScalarLike) -> Scalar:
         return self + other
 
     def __sub__(self, other: ScalarLike) -> Scalar:
-        if isinstance(other, int):
-            other = Scalar(other)
-        elif not isinstance(other, Scalar):
+        if isinstance(other, Scalar):
+            if other is Scalar.ZERO and self._is_fast_identity():
+                return self
+            other_data = other.data
+        elif isinstance(other, int):
+            if other == 0 and self._is_fast_identity():
+                return self
+            other_data = _int_array(other)
+        else:
             return NotImplemented
-        out = Scalar()
-        lib.crypto_core_ed25519_scalar_sub(out.data, self.data, other.data)
+        out = Scalar._new()
+        lib.crypto_core_ed25519_scalar_sub(out.data, self.data, other_data)
         return out
 
     def __rsub__(self, other: ScalarLike) -> Scalar:
@@ -128,12 +248,22 @@ class Scalar:
 
     def __mul__(self, other: ScalarLike) -> Scalar:
         """Multiply two scalars modulus L."""
-        if isinstance(other, int):
-            other = Scalar(other)
-        elif not isinstance(other, Scalar):
+        if isinstance(other, Scalar):
+            if other is Scalar.ZERO and Scalar.FAST_VARTIME:
+                return Scalar._new()
+            if other is Scalar.ONE and self._is_fast_identity():
+                return self
+            other_data = other.data
+        elif isinstance(other, int):
+            if other == 0 and Scalar.FAST_VARTIME:
+                return Scalar._new()
+            if other == 1 and self._is_fast_identity():
+                return self
+            other_data = _int_array(other)
+        else:
             return NotImplemented
-        out = Scalar()
-        lib.crypto_core_ed25519_scalar_mul(out.data, self.data, other.data)
+        out = Scalar._new()
+        lib.crypto_core_ed25519_scalar_mul(out.data, self.data, other_data)
         return out
 
     def __rmul__(self, other: ScalarLike) -> Scalar:
@@ -144,13 +274,19 @@ class Scalar:
 
         Division is implemented as inversion followed by multiplication.
         """
-        if isinstance(other, int):
-            other = Scalar(other)
-        elif not isinstance(other, Scalar):
+        if isinstance(other, Scalar):
+            if other is Scalar.ONE and self._is_fast_identity():
+                return self
+            other_data = other.data
+        elif isinstance(other, int):
+            if other == 1 and self._is_fast_identity():
+                return self
+            other_data = _int_array(other)
+        else:
             return NotImplemented
-        inverted = Scalar()
-        lib.crypto_core_ed25519_scalar_invert(inverted.data, other.data)
-        if self == 1:
+        inverted = Scalar._new()
+        lib.crypto_core_ed25519_scalar_invert(inverted.data, other_data)
+        if Scalar.FAST_VARTIME and self == 1:
             return inverted
         return self * inverted
 
@@ -162,17 +298,33 @@ class Scalar:
         return other / self
 
     def __neg__(self) -> Scalar:
-        out = Scalar()
+        out = Scalar._new()
         lib.crypto_core_ed25519_scalar_negate(out.data, self.data)
         return out
 
     def __eq__(self, other: Any) -> bool:
-        if isinstance(other, int):
-            return int(self) == other
-        elif isinstance(other, Scalar):
-            return bytes(self.data) == bytes(other.data)
+        # Scalars can be secret, so they are compared in constant time
+        if isinstance(other, Scalar):
+            other_data = other.data
+        elif isinstance(other, int):
+            if not 0 <= other < _INT_BOUND:
+                return False
+            other_data = _int_array(other)
         else:
             return False
+        result = lib.sodium_memcmp(
+            self.data, other_data, lib.crypto_core_ed25519_SCALARBYTES
+        )
+        return cast(bool, result == 0)
+
+
+Scalar.ZERO = Scalar(0)
+Scalar.ONE = Scalar(1)
+
+
+def _int_array(n: int) -> ffi.CData:
+    """Convert an integer operand into an array that is only read by libsodium."""
+    return as_array_readonly(n.to_bytes(lib.crypto_core_ed25519_SCALARBYTES, "little"))
 
 
 ScalarLike = Union[Scalar, int]
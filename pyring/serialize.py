@@ -14,31 +14,36 @@
 
 import base64
 import string
-import textwrap
 import uuid
+from typing import Iterable
 
 import pyasn1.codec.der.encoder
 import pyasn1.codec.der.decoder
-import pyasn1.codec.native.decoder
 from pyasn1.type.namedtype import NamedType, NamedTypes
 from pyasn1.type.univ import Sequence, SequenceOf, OctetString, ObjectIdentifier
 
 from .ge import Point
 from .sc25519 import Scalar
 from .one_time import RingSignature
+from ._sodium import ffi
 
 
 _PEM_OPENING = "-----BEGIN RING SIGNATURE-----"
 _PEM_CLOSING = "-----END RING SIGNATURE-----"
-_UUID = uuid.UUID(hex="3b5e61af-c4ec-496e-95e9-4b64bccdc809")
+_UUID = uuid.UUID(hex="678eec2e-714e-472a-a1e3-603bd9bff2bd")
 _OBJECT_ID = (2, 25) + tuple(_UUID.bytes)
+# Signatures made by pyring 0.0.2 and earlier hash to points and scalars differently
+# (SHA3-512, and reducing modulo Q), so they can't be verified by this version
+_LEGACY_UUID = uuid.UUID(hex="3b5e61af-c4ec-496e-95e9-4b64bccdc809")
+_LEGACY_OBJECT_ID = (2, 25) + tuple(_LEGACY_UUID.bytes)
 
 
 class RingSignatureSchema(Sequence):
     """An ASN.1 schema for ring signatures.
 
     Ring signatures are identified with an object ID following Recommendation
-    ITU-T X.667. The UUID4 used is 3b5e61af-c4ec-496e-95e9-4b64bccdc809.
+    ITU-T X.667. The UUID4 used is 678eec2e-714e-472a-a1e3-603bd9bff2bd. Signatures
+    made by pyring 0.0.2 and earlier used 3b5e61af-c4ec-496e-95e9-4b64bccdc809.
     """
 
     componentType = NamedTypes(
@@ -50,22 +55,47 @@ class RingSignatureSchema(Sequence):
     )
 
 
+def _der_header(tag: int, length: int) -> bytes:
+    """Encode the identifier and length octets of a DER element."""
+    if length < 0x80:
+        return bytes([tag, length])
+    length_octets = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([tag, 0x80 | len(length_octets)]) + length_octets
+
+
+_SEQUENCE_TAG = 0x30
+_OCTET_STRING_TAG = 0x04
+_OBJECT_ID_DER = pyasn1.codec.der.encoder.encode(ObjectIdentifier(_OBJECT_ID))
+# Points and scalars are all 32 bytes, so each octet string has the same header
+_ELEMENT_HEADER = _der_header(_OCTET_STRING_TAG, 32)
+
+
+def _der_sequence_of(elements: Iterable[ffi.CData]) -> bytes:
+    """Encode a sequence of 32-byte arrays as a DER SEQUENCE OF OCTET STRING."""
+    body = b"".join(_ELEMENT_HEADER + ffi.buffer(element)[:] for element in elements)
+    return _der_header(_SEQUENCE_TAG, len(body)) + body
+
+
 def export_pem(ring_signature: RingSignature) -> str:
-    """Export the ring signature to a PEM file."""
-    der = pyasn1.codec.der.encoder.encode(
-        pyasn1.codec.native.decoder.decode(
-            {
-                "key_image": bytes(ring_signature.key_image.data),
-                "public_keys": [
-                    bytes(public_key.data) for public_key in ring_signature.public_keys
-                ],
-                "r": [bytes(r.data) for r in ring_signature.r],
-                "c": [bytes(c.data) for c in ring_signature.c],
-            },
-            asn1Spec=RingSignatureSchema(),
-        )
+    """Export the ring signature to a PEM file.
+
+    The DER encoding follows `RingSignatureSchema`, but because the layout is fixed
+    apart from the number of ring members it is written directly.
+    """
+    body = b"".join(
+        [
+            _OBJECT_ID_DER,
+            _ELEMENT_HEADER,
+            ffi.buffer(ring_signature.key_image.data)[:],
+            _der_sequence_of([P.data for P in ring_signature.public_keys]),
+            _der_sequence_of([c.data for c in ring_signature.c]),
+            _der_sequence_of([r.data for r in ring_signature.r]),
+        ]
     )
-    der_base64 = "\n".join(textwrap.wrap(base64.b64encode(der).decode("ascii"), 64))
+    der = _der_header(_SEQUENCE_TAG, len(body)) + body
+    # Base64 has no whitespace, so the lines can be sliced instead of using textwrap
+    encoded = base64.b64encode(der).decode("ascii")
+    der_base64 = "\n".join(encoded[i : i + 64] for i in range(0, len(encoded), 64))
     return f"{_PEM_OPENING}\n{der_base64}\n{_PEM_CLOSING}"
 
 
@@ -84,6 +114,8 @@ def import_pem(signature: str) -> RingSignature:
         raise ValueError("unable to decode entire signature")
 
     # Check if the object identifier is correct
+    if asn1["field-0"] == _LEGACY_OBJECT_ID:
+        raise ValueError("signatures made by pyring 0.0.2 or earlier are unsupported")
     if asn1["field-0"] != _OBJECT_ID:
         raise ValueError("invalid object ID")
 
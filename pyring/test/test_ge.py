@@ -19,7 +19,14 @@ import pytest
 
 from pyring._sodium import ffi, lib
 from pyring.sc25519 import Scalar, L
-from pyring.ge import Point, O, G, hash_to_scalar, Q
+from pyring.ge import (
+    Point,
+    O,
+    G,
+    double_scalar_mult,
+    hash_chunks_to_scalar,
+    hash_to_scalar,
+)
 
 
 def test_point_constructors():
@@ -58,6 +65,15 @@ def test_point_arithmetic():
 
     assert p != 2 * p
     assert p != object()
+    assert len({p, Point(p.as_bytes()), 2 * p}) == 2
+
+    # Chained arithmetic on cached extended coordinates matches libsodium
+    q = Point.from_uniform(hashlib.blake2s(b"other").digest())
+    for op in ("add", "sub"):
+        out = ffi.new("unsigned char[]", lib.crypto_core_ed25519_BYTES)
+        getattr(lib, f"crypto_core_ed25519_{op}")(out, (p + q).data, q.data)
+        expected = p + q + q if op == "add" else p + q - q
+        assert expected.as_bytes() == bytes(out)
 
     fe = Scalar(2)
     f = 2.3
@@ -81,6 +97,28 @@ def test_generator():
         f * G
 
 
+def test_double_scalar_mult():
+    p = Point.from_uniform(hashlib.blake2s(b"data").digest())
+    a, b = Scalar.random(), Scalar.random()
+
+    assert double_scalar_mult(a, p, b) == a * p + b * G
+    assert double_scalar_mult(a, p, 3) == a * p + 3 * G
+    assert double_scalar_mult(0, p, b) == b * G
+
+    q = Point.from_uniform(hashlib.blake2s(b"other data").digest())
+    assert double_scalar_mult(a, p, b, q) == a * p + b * q
+    assert double_scalar_mult(a, p, -b, q) == a * p - b * q
+    assert double_scalar_mult(a, p, 0, q) == a * p
+    assert double_scalar_mult(a, p.precompute(), b, q) == a * p + b * q
+
+    with pytest.raises(ValueError):
+        double_scalar_mult(a, O, b)
+    with pytest.raises(ValueError):
+        double_scalar_mult(a, p, b, O)
+    with pytest.raises(ValueError):
+        O.precompute()
+
+
 def test_repr():
     p = Point.from_uniform(os.urandom(32))
     assert eval(repr(p)) == p
@@ -91,12 +129,35 @@ def test_hash_to_point():
     assert p.hash_to_point().is_valid()
     assert p.hash_to_point("blake2s").is_valid()
     assert p.hash_to_point("blake2b").is_valid()
+    assert p.hash_to_point("sha3_512").is_valid()
+    digest = hashlib.blake2b(p.as_bytes()).digest()
+    assert p.hash_to_point() == Point.from_hash(digest)
+    assert p.hash_to_point() is p.hash_to_point()
+    assert p.hash_to_point() == Point(p.data).hash_to_point()
 
     with pytest.raises(ValueError):
         p.hash_to_point("sha3_224")
 
 
 def test_hash_to_scalar():
-    assert 0 <= hash_to_scalar(b"\ff" * 64) < Q
-    assert 0 <= hash_to_scalar(b"\ff" * 64, "blake2s") < Q
-    assert 0 <= hash_to_scalar(b"\ff" * 64, "sha3_224") < Q
+    assert 0 <= int(hash_to_scalar(b"\ff" * 64)) < L
+    assert 0 <= int(hash_to_scalar(b"\ff" * 64, "blake2s")) < L
+    assert 0 <= int(hash_to_scalar(b"\ff" * 64, "sha3_224")) < L
+
+    digest = hashlib.blake2b(b"data").digest()
+    assert hash_to_scalar(b"data") == int.from_bytes(digest, "little") % L
+    assert hash_to_scalar(bytearray(b"data")) == int.from_bytes(digest, "little") % L
+    assert hash_to_scalar(list(b"data")) == int.from_bytes(digest, "little") % L
+    digest = hashlib.sha3_512(b"data").digest()
+    assert hash_to_scalar(b"data", "sha3_512") == int.from_bytes(digest, "little") % L
+    assert hash_to_scalar([1, 2], "sha3_512") == hash_to_scalar(b"\x01\x02", "sha3_512")
+    digest = hashlib.blake2s(b"data").digest()
+    assert hash_to_scalar(b"data", "blake2s") == int.from_bytes(digest, "little") % L
+
+
+def test_hash_chunks_to_scalar():
+    chunks = [b"data", bytearray(b"more data"), G.data, [1, 2, 3]]
+    data = b"".join(bytes(chunk) for chunk in chunks)
+    assert hash_chunks_to_scalar(chunks) == hash_to_scalar(data)
+    assert hash_chunks_to_scalar(chunks, "sha3_512") == hash_to_scalar(data, "sha3_512")
+    assert hash_chunks_to_scalar(chunks, "blake2s") == hash_to_scalar(data, "blake2s")
@@ -16,7 +16,11 @@ import dataclasses
 import os
 import random
 
-from pyring.one_time import PrivateKey, ring_sign, ring_verify
+import pytest
+
+from pyring import one_time
+from pyring.ge import O, Point
+from pyring.one_time import PrivateKey, RingBatch, ring_sign, ring_verify
 from pyring.sc25519 import Scalar
 
 
@@ -24,6 +28,8 @@ def test_keys():
     private_key = PrivateKey.generate()
     public_key = private_key.public_key()
     assert public_key.point.is_valid()
+    key_image = private_key.scalar * public_key.point.hash_to_point()
+    assert private_key.key_image() == key_image
 
     private_key = PrivateKey.from_private_bytes(bytes(Scalar.random().data))
 
@@ -57,5 +63,114 @@ def test_one_time():
     assert not ring_verify(message, wrong_public_keys)
     wrong_image = dataclasses.replace(signature, key_image=2 * signature.key_image)
     assert not ring_verify(message, wrong_image)
+    invalid_image = dataclasses.replace(signature, key_image=O)
+    assert not ring_verify(message, invalid_image)
+    missing_key = dataclasses.replace(signature, public_keys=public_keys[1:])
+    assert not ring_verify(message, missing_key)
     signature.c[0] += 1
     assert not ring_verify(message, signature)
+
+
+def test_invalid_public_key():
+    private_key = PrivateKey.generate()
+    public_keys = [private_key.public_key().point, O]
+    with pytest.raises(ValueError):
+        ring_sign(b"message", public_keys, private_key.scalar, 0)
+
+
+def test_invalid_key_index():
+    private_key = PrivateKey.generate()
+    public_keys = [PrivateKey.generate().public_key().point for _ in range(3)]
+    public_keys[1] = private_key.public_key().point
+    for key_index in (-1, len(public_keys)):
+        with pytest.raises(IndexError):
+            ring_sign(b"message", public_keys, private_key.scalar, key_index)
+
+
+def test_ring_arguments_lengths():
+    public_keys = [PrivateKey.generate().public_key().point for _ in range(3)]
+    scalars = [Scalar.random() for _ in range(3)]
+    with pytest.raises(ValueError):
+        one_time._ring_arguments(public_keys, scalars[:2], scalars)
+    with pytest.raises(ValueError):
+        one_time._ring_arguments(public_keys, scalars, scalars[:2])
+
+
+def test_signer_index_independent(monkeypatch):
+    private_keys = [PrivateKey.generate() for _ in range(5)]
+    public_keys = [private_key.public_key().point for private_key in private_keys]
+    ring_points = one_time._ring_points
+    calls = []
+
+    def record(buffer_, offset, public_keys, r, c, key_image):
+        calls.append(len(public_keys))
+        ring_points(buffer_, offset, public_keys, r, c, key_image)
+
+    monkeypatch.setattr(one_time, "_ring_points", record)
+    for key_index in (0, 2, 4):
+        calls.clear()
+        signature = ring_sign(
+            b"message", public_keys, private_keys[key_index].scalar, key_index
+        )
+        assert calls == [4]
+        assert ring_verify(b"message", signature)
+
+
+def test_single_key():
+    private_key = PrivateKey.generate()
+    public_keys = [private_key.public_key().point]
+    signature = ring_sign(b"message", public_keys, private_key.scalar, 0)
+    assert ring_verify(b"message", signature)
+
+
+def test_threads(monkeypatch):
+    monkeypatch.setattr(one_time.os, "cpu_count", lambda: 4)
+    private_keys = [PrivateKey.generate() for _ in range(50)]
+    public_keys = [private_key.public_key().point for private_key in private_keys]
+    signature = ring_sign(b"message", public_keys, private_keys[10].scalar, 10)
+
+    monkeypatch.setattr(one_time.os, "cpu_count", lambda: 1)
+    assert ring_verify(b"message", signature)
+    monkeypatch.setattr(one_time.os, "cpu_count", lambda: 3)
+    assert ring_verify(b"message", signature)
+    assert not ring_verify(b"other message", signature)
+
+
+def test_threads_shared_points(monkeypatch):
+    monkeypatch.setattr(one_time.os, "cpu_count", lambda: 4)
+    private_keys = [PrivateKey.generate() for _ in range(8)]
+    public_keys = [private_key.public_key().point for private_key in private_keys]
+    signature = ring_sign(b"message", public_keys * 8, private_keys[2].scalar, 2)
+
+    # Fresh points without cached tables, each appearing in every thread's chunk
+    points = [Point(P_i.data) for P_i in public_keys]
+    signature = dataclasses.replace(signature, public_keys=points * 8)
+    ring_points_chunk = one_time._ring_points_chunk
+
+    def check_cached(buffer_, offset, public_keys, r, c, key_image):
+        assert all(P_i._hashed[1]._table is not None for P_i in public_keys)
+        ring_points_chunk(buffer_, offset, public_keys, r, c, key_image)
+
+    monkeypatch.setattr(one_time, "_ring_points_chunk", check_cached)
+    assert ring_verify(b"message", signature)
+
+    _, tables = one_time._ring_arguments(points, signature.r[:8], signature.c[:8])
+    assert tables == [P_i.hash_to_point()._table for P_i in points]
+
+
+def test_batch():
+    private_keys = [PrivateKey.generate() for _ in range(10)]
+    public_keys = [private_key.public_key().point for private_key in private_keys]
+
+    batch = RingBatch()
+    assert batch.verify()
+    for i in range(5):
+        # Use copies of the points, as if the signatures were deserialized
+        ring = [Point(P.as_bytes()) for P in public_keys[i : i + 5]]
+        message = os.urandom(100)
+        signature = ring_sign(message, ring, private_keys[i].scalar, 0)
+        batch.add(message, signature)
+    assert batch.verify()
+
+    batch.add(b"message", signature)
+    assert not batch.verify()
@@ -31,6 +31,10 @@ def test_sc_constructors():
     assert Scalar.from_unreduced(nonreduced) == 3
 
     assert 0 < int(Scalar.random()) < L
+    scalars = Scalar.random_batch(10)
+    assert len(scalars) == 10
+    assert all(0 <= int(x) < L for x in scalars)
+    assert len({int(x) for x in scalars}) == 10
 
     assert Scalar(L + 1) == L + 1
     assert Scalar(L + 1) + 0 == 1
@@ -44,6 +48,54 @@ def test_sc_constructors():
         )
 
 
+def test_sc_sum():
+    scalars = [Scalar.random() for _ in range(10)]
+    assert Scalar.sum(scalars) == sum(int(x) for x in scalars) % L
+    assert Scalar.sum([Scalar(L + 1), Scalar(L - 1)]) == 0
+    assert Scalar.sum([]) == 0
+
+
+def test_sc_batch_add():
+    a = [Scalar.random() for _ in range(10)]
+    b = [Scalar.random() for _ in range(10)]
+    assert Scalar.batch_add(a, b) == [x + y for x, y in zip(a, b)]
+    assert Scalar.batch_add([], []) == []
+    with pytest.raises(ValueError):
+        Scalar.batch_add(a, b[1:])
+
+
+def test_sc_muladd():
+    a, b, c = Scalar.random(), Scalar.random(), Scalar.random()
+    assert Scalar.muladd(a, b, c) == (int(a) * int(b) + int(c)) % L
+    assert Scalar.mulsub(a, b, c) == (int(c) - int(a) * int(b)) % L
+    assert Scalar.mulsub(a, b, c) == c - a * b
+
+
+def test_sc_fast_vartime(monkeypatch):
+    assert not Scalar.FAST_VARTIME
+    monkeypatch.setattr(Scalar, "FAST_VARTIME", True)
+    x = Scalar(L - 2)
+    y = Scalar(3)
+    assert x + 0 == x and y + 0 is y
+    assert x - 0 == x and y - 0 is y
+    assert x * 1 == x and y * 1 is y
+    assert x / 1 == x and y / 1 is y
+    assert x * 0 == 0 and 0 * y == 0
+    assert Scalar(L + 1) * 1 == 1
+    assert y + Scalar.ZERO is y and y - Scalar.ZERO is y
+    assert y * Scalar.ONE is y and y / Scalar.ONE is y
+    assert x * Scalar.ZERO == 0 and x * Scalar.ZERO is not Scalar.ZERO
+    assert x * 0 is not Scalar.ZERO and 0 * x is not Scalar.ZERO
+    assert Scalar.ZERO == 0 and Scalar.ONE == 1
+
+    monkeypatch.setattr(Scalar, "FAST_VARTIME", False)
+    assert y + 0 is not y
+    assert y * 1 is not y
+    assert y * 0 == 0
+    assert y * Scalar.ONE is not y
+    assert x * Scalar.ZERO == 0
+
+
 def test_sc_repr():
     x = Scalar.random()
     assert eval(repr(x)) == x
@@ -85,6 +137,8 @@ def test_sc_arithmetic():
 
     assert x != x + 1
     assert x != object()
+    assert x == L - 2 and x != L - 1
+    assert Scalar(0) != -1 and Scalar(0) != 2 ** 256
 
     f = 2.3
     with pytest.raises(TypeError):
@@ -20,13 +20,20 @@ from ._sodium import ffi
 
 ByteLike = Union[ffi.CData, collections.abc.ByteString]
 
+# Objects of other types are converted to bytes before being passed to CFFI
+_BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+# Looking up the type once saves parsing the type string on every allocation
+UCHAR_ARRAY = ffi.typeof("unsigned char[]")
+
 
 def as_array(data: ByteLike) -> ffi.CData:
     """Convert a bytes-like object into an FFI-array.
 
     Args:
-        data: An object that can convert to a list of integers.
-            If an FFI array is passed, it will be returned as is.
+        data: An object supporting the buffer protocol, or otherwise an object that
+            can be converted to bytes (e.g. a sequence of integers). If an FFI array
+            is passed, it will be returned as is.
 
     Returns:
         An FFI `CData` array with the given value.
@@ -34,5 +41,31 @@ def as_array(data: ByteLike) -> ffi.CData:
     """
     if isinstance(data, ffi.CData):
         return data
-    array = ffi.new("unsigned char[]", list(data))
+    if not isinstance(data, _BUFFER_TYPES):
+        data = bytes(data)
+    n = len(data)
+    array = ffi.new(UCHAR_ARRAY, n)
+    ffi.memmove(array, data, n)
     return array
+
+
+def as_array_readonly(data: ByteLike) -> ffi.CData:
+    """Convert a bytes-like object into an FFI-array without copying it if possible.
+
+    The returned array can point directly into the memory of `data`, so it should
+    only be passed to functions that read from it (i.e. take a `const` pointer) and
+    it must not outlive `data`.
+
+    Args:
+        data: A bytes-like object. Other objects are converted to bytes first, as
+            for `as_array`.
+
+    Returns:
+        An FFI `CData` array with the given value.
+
+    """
+    if isinstance(data, ffi.CData):
+        return data
+    if not isinstance(data, _BUFFER_TYPES):
+        data = bytes(data)
+    return ffi.from_buffer(UCHAR_ARRAY, data)
@@ -13,15 +13,23 @@
 # limitations under the License.
 
 import distutils
+import distutils.errors
+import distutils.log
 import glob
 import os
 import pathlib
+import re
+import shlex
+import subprocess
 from typing import List
 
 import setuptools
 from setuptools.command.build_ext import build_ext as _build_ext
 from setuptools.command.build_clib import build_clib as _build_clib
 
+# The bindings use Sodium's internals, so they are only built against this version
+SODIUM_VERSION = "1.0.20"
+
 
 class Distribution(setuptools.Distribution):
     def has_c_libraries(self) -> bool:
@@ -51,6 +59,12 @@ class build_ext(_build_ext):
                 flag for flag in cvs["CFLAGS"].split(" ") if not flag.startswith("-I")
             )
 
+        # The bindings are called for every operation, so optimize them fully.
+        # Flags given in CFLAGS are passed after these, so they take precedence.
+        if self.compiler in (None, "unix") and os.name == "posix":
+            cvs["CFLAGS"] += " -O3 -fomit-frame-pointer -fvisibility=hidden -flto"
+            cvs["LDSHARED"] += " -flto"
+
         # Build the bindings
         super().run()
 
@@ -71,16 +85,59 @@ class build_clib(_build_clib):
 
         # We package a stable version of libsodium with the library
         src_dir = pathlib.Path("libsodium").resolve()
-        root_dir = os.getcwd()
-
-        # Now build libsodium statically (to avoid linker issues)
-        os.chdir(build_temp)
-        self.spawn([f"{src_dir}/configure", f"--prefix={build_temp}",
-                    "--disable-shared", "--with-pic"])
-        self.spawn(["make"])
-        self.spawn(["make", "install"])
+        configure_ac = (src_dir / "configure.ac").read_text()
+        match = re.search(r"AC_INIT\(\[libsodium\],\[([^\]]+)\]", configure_ac)
+        if not match or match.group(1) != SODIUM_VERSION:
+            raise distutils.errors.DistutilsSetupError(
+                f"pyring requires Sodium {SODIUM_VERSION}, run "
+                f"'git -C libsodium checkout {SODIUM_VERSION}-RELEASE'"
+            )
 
-        os.chdir(root_dir)
+        # Sodium is portable by default, but it can be optimized for the CPU it is
+        # built on (PYRING_NATIVE=1) or for a given architecture (PYRING_MARCH)
+        configure_args = [
+            f"--prefix={build_temp}",
+            "--disable-shared",
+            "--with-pic",
+            "--disable-dependency-tracking",
+        ]
+        if os.environ.get("PYRING_NATIVE") == "1":
+            configure_args.append("--enable-opt")
+        march = os.environ.get("PYRING_MARCH")
+        if march:
+            # Sodium only adds its default optimization flags if CFLAGS isn't set
+            cflags = os.environ.get("CFLAGS", "-O3")
+            configure_args.append(f"CFLAGS={cflags} -march={march}")
+
+        # Skip the build if the library was built with the same options and the
+        # sources haven't changed since
+        lib_path = build_temp / "lib" / "libsodium.a"
+        stamp_path = build_temp / "pyring-configure.stamp"
+        stamp = " ".join(configure_args)
+        if (
+            not self.force
+            and lib_path.exists()
+            and stamp_path.exists()
+            and stamp_path.read_text() == stamp
+        ):
+            src_mtime = max(p.stat().st_mtime for p in src_dir.rglob("*.[ch]"))
+            if lib_path.stat().st_mtime >= src_mtime:
+                return
+
+        # Now build libsodium statically (to avoid linker issues), running the
+        # steps in a single shell in the build directory
+        commands = [
+            [str(src_dir / "configure")] + configure_args,
+            ["make", "-j", str(os.cpu_count() or 2)],
+            ["make", "install"],
+        ]
+        script = " && ".join(
+            " ".join(shlex.quote(arg) for arg in command) for command in commands
+        )
+        self.announce(script, level=distutils.log.INFO)
+        if not self.dry_run:
+            subprocess.run(script, shell=True, check=True, cwd=build_temp)
+            stamp_path.write_text(stamp)
 
 
 with open("README.md", "r") as fh:
@@ -89,7 +146,7 @@ with open("README.md", "r") as fh:
 
 setuptools.setup(
     name="pyring",
-    version="0.0.2",
+    version="0.1.0",
     author="Bart van Merriënboer",
     author_email="bart.vanmerrienboer@gmail.com",
     description="Ring signatures",
@@ -110,6 +167,6 @@ setuptools.setup(
     ext_package="pyring",
     setup_requires=["cffi"],
     zip_safe=False,
-    install_requires=["cryptography", "cffi"],
+    install_requires=["cryptography", "cffi", "pyasn1"],
     scripts=glob.glob("bin/*"),
 )